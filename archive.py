@@ -1,6 +1,7 @@
 import logging
 from datetime import datetime, timezone
 from typing import List
+from concurrent.futures import ThreadPoolExecutor
 
 import pandas as pd
 from gspread.client import Client as SheetsClient
@@ -8,14 +9,17 @@ from googleapiclient.discovery import Resource as DriveClient
 from qdrant_client import QdrantClient
 
 from env_config import rag_config, env_config
-from utils.gcp_utils import move_file, fetch_sheet_as_df
+from utils.gcp_utils import move_file, fetch_sheet_as_df, get_thread_drive_client
 from utils.qdrant_utils import delete_records_by_pdf_id
 from utils.library_utils import fetch_rows_by_status, remove_rows, append_new_rows
-from utils.log_writer import log_event
+from utils.log_writer import log_events
 
 
 config = env_config()
 
+# Drive moves for archived rows run on this many threads
+MAX_CONCURRENT_ARCHIVES = 8
+
 
 def archive_tagged(
     drive_client: DriveClient,
@@ -25,7 +29,9 @@ def archive_tagged(
     """Archive rows and PDFs marked for archiving.
 
     Moves the corresponding PDF to ``PDF_ARCHIVE``, deletes Qdrant records,
-    appends the row to ``LIBRARY_ARCHIVE`` and removes it from ``LIBRARY_UNIFIED``.
+    appends the rows to ``LIBRARY_ARCHIVE`` in one call and then removes them
+    from ``LIBRARY_UNIFIED``. Rows are only removed once the append succeeds,
+    and rows whose PDF could not be moved are left in place untouched.
     """
     target_statuses: List[str] = ["live_for_archive"]
 
@@ -35,39 +41,70 @@ def archive_tagged(
         logging.info("No rows marked for archive. No further action taken.")
         return pd.DataFrame()
 
-    archived_rows = []
+    # Map each pdf_id to its LIBRARY_UNIFIED row positions once instead of scanning the sheet per row
+    rows_by_pdf_id = library_df.groupby("pdf_id").indices
+
+    collection_name = rag_config("qdrant_collection_name")
+    # Every row in the batch shares one archive timestamp
+    timestamp_archived = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    archived_df = rows_to_archive.assign(timestamp_archived=timestamp_archived)
+    file_ids = archived_df.get("gcp_file_id", pd.Series(None, index=archived_df.index, dtype=object))
+
+    def archive_file(file_id: str) -> bool:
+        # Each worker uses its own Drive client; the rows are independent of one another
+        return move_file(get_thread_drive_client(drive_client), file_id, config["PDF_ARCHIVE"])
+
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_ARCHIVES) as executor:
+        futures = [executor.submit(archive_file, file_id) for file_id in file_ids]
+        moved = []
+        for pdf_id, future in zip(archived_df["pdf_id"], futures):
+            try:
+                moved.append(bool(future.result()))
+            except Exception as e:  # pragma: no cover - log only
+                logging.error("Failed to move %s to PDF_ARCHIVE: %s", pdf_id, e)
+                moved.append(False)
 
-    for i, row in rows_to_archive.iterrows():
-        pdf_id = row.get("pdf_id", "[unknown]")
-        file_id = row.get("gcp_file_id")
-        filename = row.get("pdf_file_name", "unknown_file.pdf")
-        row_index = library_df[library_df["pdf_id"] == pdf_id].index.tolist()
+    # Rows whose PDF could not be moved stay tagged in LIBRARY_UNIFIED for the next run
+    if not all(moved):
+        logging.warning("⚠️ %s PDF(s) could not be moved to PDF_ARCHIVE and were skipped.", moved.count(False))
+        archived_df = archived_df[moved]
+        if archived_df.empty:
+            return pd.DataFrame()
 
-        move_file(drive_client, file_id, config["PDF_ARCHIVE"])
-        delete_records_by_pdf_id(
-            qdrant_client,
-            rag_config("qdrant_collection_name"),
-            pdf_id,
+    # Pull the columns the remaining steps need once instead of materialising a Series per row
+    pdf_ids = archived_df["pdf_id"].astype(str).tolist()
+    file_names = archived_df.get("pdf_file_name", pd.Series("unknown_file.pdf", index=archived_df.index))
+    row_indices: List[int] = [int(i) for pdf_id in archived_df["pdf_id"] for i in rows_by_pdf_id.get(pdf_id, [])]
+
+    # A single filtered delete covers every archived pdf_id
+    delete_records_by_pdf_id(qdrant_client, collection_name, pdf_ids)
+
+    # One append to LIBRARY_ARCHIVE and one removal pass on LIBRARY_UNIFIED for the whole batch
+    appended = append_new_rows(
+        sheets_client,
+        spreadsheet_id=config["LIBRARY_ARCHIVE"],
+        new_rows_df=archived_df,
+        sheet_name="Sheet1",
+    )
+    if len(appended) != len(archived_df):
+        logging.error(
+            "❌ Failed to append %s row(s) to LIBRARY_ARCHIVE. Rows left in LIBRARY_UNIFIED.",
+            len(archived_df),
         )
+        return pd.DataFrame()
 
-        row["timestamp_archived"] = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
-        append_new_rows(
+    try:
+        remove_rows(
             sheets_client,
-            spreadsheet_id=config["LIBRARY_ARCHIVE"],
-            new_rows_df=pd.DataFrame([row]),
-            sheet_name="Sheet1",
+            spreadsheet_id=config["LIBRARY_UNIFIED"],
+            row_indices=row_indices,
         )
+    except Exception as e:  # pragma: no cover - log only
+        logging.error("Failed to remove archived rows %s: %s", row_indices, e)
 
-        try:
-            remove_rows(
-                sheets_client,
-                spreadsheet_id=config["LIBRARY_UNIFIED"],
-                row_indices=row_index,
-            )
-        except Exception as e:  # pragma: no cover - log only
-            logging.error("Failed to remove row %s for %s: %s", i, pdf_id, e)
-
-        archived_rows.append(row)
-        log_event(sheets_client, "archived", str(pdf_id), str(filename))
+    log_events(sheets_client, [
+        {"action": "archived", "pdf_id": pdf_id, "pdf_file_name": str(file_name)}
+        for pdf_id, file_name in zip(pdf_ids, file_names)
+    ])
 
-    return pd.DataFrame(archived_rows)
+    return archived_df
@@ -1,20 +1,27 @@
+import numpy as np
 import pandas as pd
-from typing import Tuple, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Tuple, List, Optional
+from itertools import chain
 import logging
 from gspread.client import Client as SheetsClient
+from gspread.utils import rowcol_to_a1
 from googleapiclient.discovery import Resource as DriveClient
 from qdrant_client import QdrantClient
 
 from env_config import env_config, rag_config
-from utils.gcp_utils import fetch_sheet_as_df, list_files_in_folder, get_folder_name, file_exists
-from utils.library_utils import fetch_rows_by_status, remove_rows
-from utils.log_writer import log_event
+from utils.gcp_utils import (
+    fetch_sheet_as_df,
+    list_files_in_folder,
+    get_folder_names,
+    get_thread_drive_client,
+    delete_files,
+)
+from utils.library_utils import contiguous_runs, fetch_rows_by_status, remove_rows
+from utils.log_writer import log_events
 from utils.qdrant_utils import (
-    get_summaries_by_pdf_id,
-    get_gcp_file_ids_by_pdf_id,
-    get_all_pdf_ids_in_qdrant,
-    delete_records_by_pdf_id, 
-    in_qdrant
+    get_pdf_summaries_and_file_ids,
+    delete_records_by_pdf_id,
 )
 
 
@@ -22,7 +29,11 @@ from utils.qdrant_utils import (
 config = env_config()
 
 
-def build_status_map(drive_client, sheets_client, qdrant_client) -> Tuple[pd.DataFrame, pd.DataFrame]:
+def build_status_map(
+    drive_client,
+    sheets_client,
+    qdrant_client,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
     """
     Build a comprehensive status map of PDF records across Google Sheets (LIBRARY_UNIFIED), 
     Google Drive (PDF_LIVE), and Qdrant (vector database), identifying inconsistencies 
@@ -68,7 +79,21 @@ def build_status_map(drive_client, sheets_client, qdrant_client) -> Tuple[pd.Dat
             - status_df: Complete status map for all live documents
             - issues_only: Subset of `status_df` containing rows with one or more issues
     """
-    library_df = fetch_sheet_as_df(sheets_client, config["LIBRARY_UNIFIED"])
+    collection = rag_config("qdrant_collection_name")
+
+    # The Sheet, Drive and Qdrant reads are independent network calls, so run them side by side.
+    # None of them is served from a cache: the status map is a diagnostic of current state.
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        library_future = executor.submit(fetch_sheet_as_df, sheets_client, config["LIBRARY_UNIFIED"])
+        qdrant_future = executor.submit(get_pdf_summaries_and_file_ids, qdrant_client, collection)
+        drive_future = executor.submit(
+            lambda: list_files_in_folder(get_thread_drive_client(drive_client), config["PDF_LIVE"])
+        )
+
+        library_df = library_future.result()
+        qdrant_summary, qdrant_files = qdrant_future.result()
+        drive_df = drive_future.result()
+
     if library_df.empty:
         logging.warning("LIBRARY_UNIFIED is empty or unavailable")
         return pd.DataFrame()
@@ -77,57 +102,40 @@ def build_status_map(drive_client, sheets_client, qdrant_client) -> Tuple[pd.Dat
     if live_df.empty:
         return pd.DataFrame()
 
-    # Flag duplicates and empty IDs while values are still raw
-    live_df["empty_pdf_id_in_sheet"] = live_df["pdf_id"].isna() | (live_df["pdf_id"].astype(str).str.strip() == "")
-    live_df["empty_gcp_file_id_in_sheet"] = live_df["gcp_file_id"].isna() | (
-        live_df["gcp_file_id"].astype(str).str.strip() == ""
-    )
+    # Flag duplicates and empty IDs while values are still raw; each ID column is cast to str once
+    pdf_ids = live_df["pdf_id"].astype(str)
+    sheet_file_ids = live_df["gcp_file_id"].astype(str)
+    live_df["empty_pdf_id_in_sheet"] = live_df["pdf_id"].isna() | (pdf_ids.str.strip() == "")
+    live_df["empty_gcp_file_id_in_sheet"] = live_df["gcp_file_id"].isna() | (sheet_file_ids.str.strip() == "")
 
-    live_df["pdf_id"] = live_df["pdf_id"].astype(str)
-    live_df["gcp_file_id"] = live_df["gcp_file_id"].astype(str)
+    live_df["pdf_id"] = pdf_ids
+    live_df["gcp_file_id"] = sheet_file_ids
     live_df["duplicate_pdf_id_in_sheet"] = live_df["pdf_id"].duplicated(keep=False)
     live_df["in_sheet"] = True
 
     # Drive presence
-    drive_df = list_files_in_folder(drive_client, config["PDF_LIVE"])
     drive_df["gcp_file_id"] = drive_df["ID"].astype(str)
     drive_df["in_drive"] = True
     drive_df.rename(columns={"Name": "file_name"}, inplace=True)
-    drive_ids = set(drive_df["gcp_file_id"])
 
-    # Qdrant summaries and file-id mapping
-    collection = rag_config("qdrant_collection_name")
-    pdf_ids: List[str] = live_df["pdf_id"].dropna().tolist()
-    qdrant_summary = get_summaries_by_pdf_id(qdrant_client, collection, pdf_ids)
-    qdrant_summary = qdrant_summary.copy()
-    qdrant_summary.rename(columns={"pdf_file_name": "file_name"}, inplace=True)
-    if not qdrant_summary.empty:
-        qdrant_summary["in_qdrant"] = True
-    qdrant_files = get_gcp_file_ids_by_pdf_id(qdrant_client, collection, pdf_ids)
-
-    # Identify drive files not referenced in Sheet or Qdrant
+    # Qdrant summaries and file-id mapping. Live and orphan pdf_ids together cover the whole
+    # collection, so one unfiltered scroll yields every pdf_id, summary and file id at once.
+    orphan_pdf_ids = sorted(set(qdrant_files["pdf_id"]) - set(live_df["pdf_id"]))
+    qdrant_summary = qdrant_summary.rename(columns={"pdf_file_name": "file_name"})
+    qdrant_summary["in_qdrant"] = True
+
+    # Identify drive files not referenced in Sheet or by a live pdf_id in Qdrant
     qdrant_file_ids: set[str] = set()
     if not qdrant_files.empty and "gcp_file_ids" in qdrant_files.columns:
-        qdrant_file_ids = set(
-            qdrant_files["gcp_file_ids"].explode().dropna().astype(str).tolist()
-        )
-    sheet_file_ids = set(live_df["gcp_file_id"])
-    orphan_drive_ids = drive_ids - sheet_file_ids - qdrant_file_ids
-    orphan_drive_df = drive_df[drive_df["gcp_file_id"].isin(orphan_drive_ids)].copy()
-
-    # Orphan pdf_ids present only in Qdrant
-    all_pdf_ids = set(get_all_pdf_ids_in_qdrant(qdrant_client, collection))
-    orphan_pdf_ids = sorted(all_pdf_ids - set(live_df["pdf_id"]))
-    if orphan_pdf_ids:
-        orphan_summary = get_summaries_by_pdf_id(qdrant_client, collection, orphan_pdf_ids)
-        orphan_summary = orphan_summary.copy()
-        orphan_summary.rename(columns={"pdf_file_name": "file_name"}, inplace=True)
-        if not orphan_summary.empty:
-            orphan_summary["in_qdrant"] = True
-            qdrant_summary = pd.concat([qdrant_summary, orphan_summary], ignore_index=True)
-        orphan_files = get_gcp_file_ids_by_pdf_id(qdrant_client, collection, orphan_pdf_ids)
-        if not orphan_files.empty:
-            qdrant_files = pd.concat([qdrant_files, orphan_files], ignore_index=True)
+        live_files = qdrant_files[~qdrant_files["pdf_id"].isin(orphan_pdf_ids)]
+        qdrant_file_ids = {
+            str(file_id)
+            for file_id in chain.from_iterable(ids for ids in live_files["gcp_file_ids"] if isinstance(ids, list))
+            if file_id is not None
+        }
+    # One membership pass over the Drive listing instead of set differences followed by isin
+    referenced_file_ids = qdrant_file_ids.union(live_df["gcp_file_id"])
+    orphan_drive_df = drive_df[~drive_df["gcp_file_id"].isin(referenced_file_ids)].copy()
 
     # Merge data
     status_df = live_df.merge(
@@ -140,16 +148,14 @@ def build_status_map(drive_client, sheets_client, qdrant_client) -> Tuple[pd.Dat
     status_df = status_df.merge(qdrant_files, on="pdf_id", how="left")
 
     if not orphan_drive_df.empty:
+        # Shape the orphans to the status map's columns in one reindex; absent columns come back as NaN
         orphan_drive_df = orphan_drive_df.assign(
             pdf_id=pd.NA,
             in_sheet=False,
             in_qdrant=False,
             pdf_file_name=orphan_drive_df["file_name"],
-        )
-        for col in status_df.columns:
-            if col not in orphan_drive_df.columns:
-                orphan_drive_df[col] = pd.NA
-        status_df = pd.concat([status_df, orphan_drive_df[status_df.columns]], ignore_index=True)
+        ).reindex(columns=status_df.columns)
+        status_df = pd.concat([status_df, orphan_drive_df], ignore_index=True)
 
     bool_cols = [
         "in_sheet",
@@ -174,39 +180,36 @@ def build_status_map(drive_client, sheets_client, qdrant_client) -> Tuple[pd.Dat
     status_df["empty_gcp_file_id_in_qdrant"] = status_df["in_qdrant"] & (status_df["unique_file_count"] == 0)
     status_df["missing_gcp_file_id"] = status_df["empty_gcp_file_id_in_sheet"] | status_df["empty_gcp_file_id_in_qdrant"]
 
-    def file_ids_match(row) -> bool | None:
-        if not row["in_qdrant"]:
-            return None
-        ids = row.get("gcp_file_ids")
-        if isinstance(ids, list):
-            return row["gcp_file_id"] in ids
-        return False
-
-    status_df["file_ids_match"] = status_df.apply(file_ids_match, axis=1)
-
-    def collect_issues(row):
-        issues: List[str] = []
-        if row.get("duplicate_pdf_id_in_sheet") is True:
-            issues.append("Duplicate pdf_id in Sheet")
-        if row.get("empty_pdf_id_in_sheet") is True:
-            issues.append("Empty pdf_id in Sheet")
-        if row.get("empty_gcp_file_id_in_sheet") is True:
-            issues.append("Empty gcp_file_id in Sheet")
-        if row.get("empty_gcp_file_id_in_qdrant") is True:
-            issues.append("Empty gcp_file_id in Qdrant")
-        if row.get("zero_record_count") is True:
-            issues.append("No Qdrant records")
-        if not row["in_drive"]:
-            issues.append("Missing in Drive")
-        if not row["in_qdrant"]:
-            issues.append("Missing in Qdrant")
-        if row["file_ids_match"] is False:
-            issues.append("Qdrant record missing expected gcp_file_id")
-        if row["in_drive"] and not row["in_sheet"] and not row["in_qdrant"]:
-            issues.append("Orphan in Drive")
-        return issues
-
-    status_df["issues"] = status_df.apply(collect_issues, axis=1)
+    # Match and issue flags are built column-wise; only the per-row list membership test stays in Python
+    in_qdrant = status_df["in_qdrant"].to_numpy(dtype=bool)
+    gcp_file_ids = status_df.get("gcp_file_ids", pd.Series(None, index=status_df.index, dtype=object))
+    ids_match = np.array(
+        [isinstance(ids, list) and gid in ids for gid, ids in zip(status_df["gcp_file_id"], gcp_file_ids)],
+        dtype=bool,
+    )
+    status_df["file_ids_match"] = np.where(in_qdrant, ids_match, None)
+
+    def flag(col: str) -> np.ndarray:
+        return status_df[col].fillna(False).to_numpy(dtype=bool)
+
+    in_drive = flag("in_drive")
+    issue_masks = [
+        (flag("duplicate_pdf_id_in_sheet"), "Duplicate pdf_id in Sheet"),
+        (flag("empty_pdf_id_in_sheet"), "Empty pdf_id in Sheet"),
+        (flag("empty_gcp_file_id_in_sheet"), "Empty gcp_file_id in Sheet"),
+        (flag("empty_gcp_file_id_in_qdrant"), "Empty gcp_file_id in Qdrant"),
+        (flag("zero_record_count"), "No Qdrant records"),
+        (~in_drive, "Missing in Drive"),
+        (~in_qdrant, "Missing in Qdrant"),
+        (in_qdrant & ~ids_match, "Qdrant record missing expected gcp_file_id"),
+        (in_drive & ~flag("in_sheet") & ~in_qdrant, "Orphan in Drive"),
+    ]
+    issues: List[List[str]] = [[] for _ in range(len(status_df))]
+    for mask, message in issue_masks:
+        for i in np.flatnonzero(mask):
+            issues[i].append(message)
+    status_df["issues"] = issues
+    has_issue = np.logical_or.reduce([mask for mask, _ in issue_masks])
 
     desired_columns = [
         "title",
@@ -232,9 +235,7 @@ def build_status_map(drive_client, sheets_client, qdrant_client) -> Tuple[pd.Dat
     ]
     status_df = status_df.reindex(columns=[c for c in desired_columns if c in status_df.columns])
     
-    issues_only = status_df[
-        status_df["issues"].apply(lambda x: isinstance(x, list) and len(x) > 0)
-    ]
+    issues_only = status_df[has_issue]
     return status_df, issues_only
 
 
@@ -254,15 +255,17 @@ def flag_rows_as_orphans(sheet, df: pd.DataFrame, orphan_rows: pd.DataFrame) ->
         List of dictionaries representing log entries for each flagged row.
     """
     log_entries = []
-    updates = []
-     
-    for _, row in orphan_rows.iterrows():
-        pdf_id = row["pdf_id"]
-        gcp_file_id = row.get("gcp_file_id", "unknown_id")
-        filename = row.get("pdf_file_name", "unknown_filename")
-        idx = df.index[df["pdf_id"] == pdf_id][0]
-        df.at[idx, "status"] = "orphan_row"
+    status_col = df.columns.get_loc("status") + 1
 
+    # Resolve every orphan to its first matching sheet row in one pass, then flag them together
+    first_index_by_pdf_id = df.index.to_series().groupby(df["pdf_id"]).first()
+    sheet_indices = orphan_rows["pdf_id"].map(first_index_by_pdf_id).astype(int)
+    df.loc[sheet_indices.unique(), "status"] = "orphan_row"
+
+    # Read the logged fields column-wise instead of boxing every orphan row into a Series
+    gcp_file_ids = orphan_rows.get("gcp_file_id", pd.Series("unknown_id", index=orphan_rows.index))
+    filenames = orphan_rows.get("pdf_file_name", pd.Series("unknown_filename", index=orphan_rows.index))
+    for pdf_id, gcp_file_id, filename in zip(orphan_rows["pdf_id"], gcp_file_ids, filenames):
         action_msg = f"orphan_row_flagged in LIBRARY_UNIFIED — pdf_id: {pdf_id}, file: {filename}"
         logging.info(action_msg)
 
@@ -272,16 +275,24 @@ def flag_rows_as_orphans(sheet, df: pd.DataFrame, orphan_rows: pd.DataFrame) ->
             "pdf_file_name": filename
         })
 
-        row_idx = idx + 2
-        updates.append({
-            "range": f"A{row_idx}:{row_idx}",
-            "values": [df.loc[idx].tolist()]
-        })
+    # Only the status cells change; adjacent orphan rows share one column range
+    runs = contiguous_runs(sheet_indices)
+    updates = [
+        {
+            "range": rowcol_to_a1(first + 2, status_col)
+            + ("" if first == last else ":" + rowcol_to_a1(last + 2, status_col)),
+            "values": [["orphan_row"]] * (last - first + 1),
+        }
+        for first, last in runs
+    ]
 
     if updates:
         try:
             sheet.batch_update(updates, value_input_option="RAW")
-            logging.info("✅ Updated %s orphan rows in LIBRARY_UNIFIED.", len(updates))
+            logging.info(
+                "✅ Updated %s orphan rows in %s range(s) in LIBRARY_UNIFIED.",
+                sum(last - first + 1 for first, last in runs), len(runs),
+            )
         except Exception as e:
             logging.error("❌ Failed batch row update in LIBRARY_UNIFIED: %s", e)
 
@@ -303,7 +314,7 @@ def delete_tagged(
         logging.info("No rows marked for deletion. No further action taken.")
         return pd.DataFrame()
 
-    duplicates_df = library_df[library_df.duplicated(subset="pdf_id", keep=False)]
+    duplicates_df = library_df[library_df["pdf_id"].duplicated(keep=False)]
     if not duplicates_df.empty:
         logging.error(
             "❌ Rows with duplicate pdf_ids found. Handle/remove duplicates before attempting deletion. No further action taken.%s",
@@ -311,60 +322,89 @@ def delete_tagged(
         )
         return pd.DataFrame()
 
-    deleted_rows = []
-
-    for _, row in rows_to_delete.iterrows():
-        file_id = str(row.get("gcp_file_id", ""))
-        pdf_id = str(row.get("pdf_id", ""))
-        filename = str(row.get("pdf_file_name", "unknown_file"))
-        original_status = str(row.get("status", "unknown_status"))
-
-        folder_name = "unknown_folder"
-        if file_exists(drive_client, file_id):
-            folder_name = get_folder_name(drive_client, file_id)
-            try:
-                drive_client.files().delete(fileId=file_id).execute()
-                log_event(
-                    sheets_client,
-                    f"file_deleted from {folder_name}",
-                    str(pdf_id),
-                    str(filename),
-                    extra_columns=[original_status],
-                )
-            except Exception as e:  # pragma: no cover - log only
-                logging.warning("Failed to delete file %s (ID: %s): %s", filename, file_id, e)
+    def column(name: str, default: str) -> List[str]:
+        values = rows_to_delete.get(name, pd.Series(default, index=rows_to_delete.index))
+        return values.astype(str).tolist()
+
+    # Map each pdf_id to its LIBRARY_UNIFIED rows once instead of scanning the sheet per row.
+    # fetch_sheet_as_df already returns every column as str, so no cast is needed here.
+    rows_by_pdf_id = library_df.groupby("pdf_id").indices
+    file_ids = column("gcp_file_id", "")
+    # Folder names for every file in two batched Drive requests instead of two calls per row
+    folder_names = get_folder_names(drive_client, file_ids)
+
+    # Drive deletes go out in batched requests too; the DELETE itself reports a missing file
+    delete_errors = delete_files(drive_client, file_ids)
+
+    def drive_result(file_id: str) -> Tuple[str, bool, Optional[Exception]]:
+        error = delete_errors.get(file_id)
+        if file_id not in delete_errors or getattr(getattr(error, "resp", None), "status", None) == 404:
+            return "unknown_folder", False, None
+        return folder_names.get(file_id, "Unknown"), error is None, error
+
+    drive_results = [drive_result(file_id) for file_id in file_ids]
+
+    qdrant_pdf_ids: List[str] = []
+    row_indices: List[int] = []
+    deleted_positions: List[int] = []
+    file_events = []
+    deleted_events = []
+
+    pdf_ids = column("pdf_id", "")
+    filenames = column("pdf_file_name", "unknown_file")
+    statuses = column("status", "unknown_status")
+
+    for position, (folder_name, file_deleted, error) in enumerate(drive_results):
+        file_id, pdf_id = file_ids[position], pdf_ids[position]
+        filename, original_status = filenames[position], statuses[position]
+
+        if file_deleted:
+            file_events.append({
+                "action": f"file_deleted from {folder_name}",
+                "pdf_id": str(pdf_id),
+                "pdf_file_name": str(filename),
+                "extra_columns": [original_status],
+            })
+        elif error is not None:
+            logging.warning("Failed to delete file %s (ID: %s): %s", filename, file_id, error)
         else:
             logging.info("File ID %s not found in Drive. Skipping deletion.", file_id)
 
-        collection_name = rag_config("qdrant_collection_name")
         if not original_status.startswith("new_for_deletion"):
-            if in_qdrant(qdrant_client, collection_name, pdf_id):
-                try:
-                    delete_records_by_pdf_id(qdrant_client, [pdf_id], collection_name)
-                except Exception as e:  # pragma: no cover - log only
-                    logging.warning("Failed to delete Qdrant record for %s: %s", pdf_id, e)
-            else:
-                logging.info("PDF ID %s not found in Qdrant. Skipping deletion.", pdf_id)
+            qdrant_pdf_ids.append(pdf_id)
         else:
             logging.info("Skipping Qdrant deletion for new record: %s", pdf_id)
 
+        matching_indices = [int(i) for i in rows_by_pdf_id.get(pdf_id, [])]
+        if not matching_indices:
+            logging.warning("No matching row index found for pdf_id %s. Skipping row deletion.", pdf_id)
+            continue
+
+        row_indices.extend(matching_indices)
+        deleted_events.append({
+            "action": "deleted",
+            "pdf_id": str(pdf_id),
+            "pdf_file_name": str(filename),
+            "extra_columns": [original_status, folder_name],
+        })
+        deleted_positions.append(position)
+
+    # A single filtered delete covers every pdf_id; ids absent from Qdrant are a no-op
+    if qdrant_pdf_ids:
         try:
-            row_indices = library_df[library_df["pdf_id"] == pdf_id].index.tolist()
-            if not row_indices:
-                logging.warning("No matching row index found for pdf_id %s. Skipping row deletion.", pdf_id)
-                continue
+            delete_records_by_pdf_id(qdrant_client, rag_config("qdrant_collection_name"), qdrant_pdf_ids)
+        except Exception as e:  # pragma: no cover - log only
+            logging.warning("Failed to delete Qdrant records for %s: %s", qdrant_pdf_ids, e)
 
+    if row_indices:
+        try:
             remove_rows(sheets_client, config["LIBRARY_UNIFIED"], row_indices=row_indices)
-            log_event(
-                sheets_client,
-                "deleted",
-                str(pdf_id),
-                str(filename),
-                extra_columns=[original_status, folder_name],
-            )
         except Exception as e:  # pragma: no cover - log only
-            logging.error("Failed to remove row for %s: %s", pdf_id, e)
+            logging.error("Failed to remove rows for %s: %s", [event["pdf_id"] for event in deleted_events], e)
+            deleted_events = []
 
-        deleted_rows.append(row)
+    # Every event for the run goes to the event log in one append
+    if file_events or deleted_events:
+        log_events(sheets_client, file_events + deleted_events)
 
-    return pd.DataFrame(deleted_rows)
+    return rows_to_delete.iloc[deleted_positions]
@@ -2,6 +2,7 @@
 
 
 import os, logging
+from functools import lru_cache
 from dotenv import load_dotenv, dotenv_values
 from pathlib import Path
 
@@ -62,7 +63,16 @@ def env_config():
     
     access varialbes like this:
     library_id = config["LIBRARY_UNIFIED"]
+
+    The .env file and Streamlit secrets are read once per process; each call
+    returns its own copy so callers can modify it safely.
     """
+    return dict(_load_env_config())
+
+
+@lru_cache(maxsize=1)
+def _load_env_config() -> dict:
+    """Build the config dictionary. Call `_load_env_config.cache_clear()` to reload."""
 
     config = {}
 
@@ -114,10 +124,13 @@ RAG_CONFIG = {
     "splitter_type": "CharacterTextSplitter",
     "chunk_size": 2000,
     "chunk_overlap": 200,
+    "pdf_partition_strategy": "fast",
     "length_function": len,
     "separators": ["}"],
     "qdrant_location": "cloud",
     "qdrant_collection_name": "ASK_vectorstore",
+    "qdrant_timeout": 60,
+    "upsert_batch_size": 64,
     "embedding_model": "text-embedding-ada-002",
     "embedding_dims": 1536,
     "vector_name": "text-dense",
@@ -1,23 +1,41 @@
 from datetime import datetime, timezone
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from gspread.client import Client as SheetsClient
+from gspread.utils import rowcol_to_a1
 from googleapiclient.discovery import Resource as DriveClient
 from qdrant_client import QdrantClient
+from langchain_qdrant import QdrantVectorStore
 from env_config import env_config, rag_config, RAG_CONFIG
-from utils.gcp_utils import file_exists, move_file, fetch_sheet_as_df, fetch_sheet
+from utils.gcp_utils import file_exists, move_file, fetch_sheet_as_df, fetch_sheet, get_thread_drive_client
 from utils.library_utils import (
     find_duplicates_against_reference,
     validate_all_rows_format,
     remove_rows,
 )
-from utils.qdrant_utils import in_qdrant
-from utils.langchain_utils import init_vectorstore, pdf_to_Docs_via_Drive, chunk_Docs
-from utils.log_writer import log_event
+from utils.qdrant_utils import in_qdrant, get_existing_pdf_ids
+from utils.langchain_utils import init_vectorstore, pdf_to_Docs_via_Drive, chunk_Docs, upload_Docs
+from utils.log_writer import log_events
 
 
 config = env_config()
 
-def upsert_single_file(drive_client: DriveClient, sheets_client: SheetsClient, qdrant_client: QdrantClient, row, idx):
+# Files are promoted concurrently since each one spends most of its time waiting on
+# Drive, OpenAI and Qdrant. Row writes to LIBRARY_UNIFIED stay serialized.
+MAX_CONCURRENT_UPSERTS = 8
+_sheet_lock = threading.Lock()
+
+
+def upsert_single_file(
+    drive_client: DriveClient,
+    sheets_client: SheetsClient,
+    qdrant_client: QdrantClient,
+    row,
+    idx,
+    vectorstore: QdrantVectorStore | None = None,
+    existing_pdf_ids: set[str] | None = None,
+):
     """
     Process and upsert a single document row into the vector database and update the associated metadata.
 
@@ -27,7 +45,7 @@ def upsert_single_file(drive_client: DriveClient, sheets_client: SheetsClient, q
     - Extracts and chunks the document content for embedding.
     - Uploads the document chunks to Qdrant.
     - Moves the PDF file to the LIVE folder in Drive.
-    - Updates the row's status in the spreadsheet and logs the event.
+    - Updates the row's status in the spreadsheet. The caller logs the event.
 
     Args:
         drive_client (DriveClient): Authenticated Google Drive client.
@@ -35,6 +53,10 @@ def upsert_single_file(drive_client: DriveClient, sheets_client: SheetsClient, q
         qdrant_client (QdrantClient): Qdrant client for vector operations.
         row (pd.Series): A row from the LIBRARY_UNIFIED dataframe representing the document metadata.
         idx (int): Index of the row in the spreadsheet (used for updating the correct cell range).
+        vectorstore (QdrantVectorStore, optional): Vectorstore shared across a promotion batch so
+            the embeddings client and collection check are set up once. Initialized here if None.
+        existing_pdf_ids (set[str], optional): pdf_ids already known to be in Qdrant, prefetched
+            for the whole batch. If None, Qdrant is queried for this pdf_id.
 
     Returns:
         Tuple[str, str]: A tuple containing:
@@ -54,7 +76,11 @@ def upsert_single_file(drive_client: DriveClient, sheets_client: SheetsClient, q
         return "failed", pdf_id
     
     # Confirm pdf_id is not already in Qdrant
-    if in_qdrant(qdrant_client, rag_config("qdrant_collection_name"), pdf_id):
+    if existing_pdf_ids is not None:
+        already_in_qdrant = pdf_id in existing_pdf_ids
+    else:
+        already_in_qdrant = in_qdrant(qdrant_client, rag_config("qdrant_collection_name"), pdf_id)
+    if already_in_qdrant:
         logging.warning("%s already exists in Qdrant. Skipping promotion.", pdf_id)
         return "rejected", pdf_id
 
@@ -66,8 +92,8 @@ def upsert_single_file(drive_client: DriveClient, sheets_client: SheetsClient, q
         return "failed", pdf_id
 
     docs_chunks = chunk_Docs(docs, RAG_CONFIG)
-    qdrant = init_vectorstore(qdrant_client)
-    qdrant.add_documents(docs_chunks)
+    qdrant = vectorstore or init_vectorstore(qdrant_client)
+    upload_Docs(qdrant, docs_chunks, batch_size=rag_config("upsert_batch_size"))
 
     # Move PDF to PDF_LIVE folder
     move_file(drive_client, file_id, config["PDF_LIVE"])
@@ -78,29 +104,25 @@ def upsert_single_file(drive_client: DriveClient, sheets_client: SheetsClient, q
     # Set the upsert date in LIBRARY_UNIFIED
     row['upsert_date'] = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
     logging.info("Set status to live and status_timestamp, upsert_date to  for pdf_id: %s", pdf_id)
-    sheet = fetch_sheet(sheets_client, config["LIBRARY_UNIFIED"])
-    sheet.update(f"A{idx+2}", [row.tolist()])
-
-    # Remove any other rows with the same pdf_id
-    try:
-        current_df = fetch_sheet_as_df(sheets_client, config["LIBRARY_UNIFIED"])
-        all_indices = current_df.index[current_df["pdf_id"].astype(str) == pdf_id].tolist()
-        if len(all_indices) > 1:
-            keep_index = min(all_indices)
-            rows_to_remove = [i for i in all_indices if i != keep_index]
-            remove_rows(sheets_client, config["LIBRARY_UNIFIED"], rows_to_remove)
-            logging.info(
-                "Removed %s duplicate row(s) for pdf_id %s", len(rows_to_remove), pdf_id
-            )
-    except Exception as dup_err:
-        logging.error("Failed to remove duplicate rows for %s: %s", pdf_id, dup_err)
-
-    log_event(sheets_client, "promoted_to_live", str(pdf_id), str(filename))
+    with _sheet_lock:
+        # Write only the cells that changed rather than the whole row
+        sheet = fetch_sheet(sheets_client, config["LIBRARY_UNIFIED"], check_empty=False)
+        sheet.batch_update([
+            {"range": rowcol_to_a1(idx + 2, row.index.get_loc(col) + 1), "values": [[row[col]]]}
+            for col in ("status", "status_timestamp", "upsert_date")
+        ])
+
     return "uploaded", pdf_id
 
 
 
-def promote_files(drive_client: DriveClient, sheets_client: SheetsClient, qdrant_client: QdrantClient):
+def promote_files(
+    drive_client: DriveClient,
+    sheets_client: SheetsClient,
+    qdrant_client: QdrantClient,
+    max_workers: int = MAX_CONCURRENT_UPSERTS,
+    vectorstore: QdrantVectorStore | None = None,
+):
     """
     Validates and prepares rows from the LIBRARY_UNIFIED Google Sheet for promotion.
 
@@ -109,10 +131,20 @@ def promote_files(drive_client: DriveClient, sheets_client: SheetsClient, qdrant
     the first step in a larger workflow that promotes validated documents to Qdrant 
     and updates Google Drive metadata accordingly.
 
+    Valid rows are promoted concurrently on a thread pool of `max_workers` threads.
+    Each worker uses its own Drive client; a failure in one file does not stop the others.
+    All workers share one vectorstore, so embeddings and upserts reuse the same clients.
+    Once every file is done, other rows sharing a promoted pdf_id are removed in one call,
+    so row indices stay valid while workers are still writing, and the promotions are
+    logged in one append.
+
     Args:
         drive_client (DriveClient): An authenticated Google Drive client.
         sheets_client (SheetsClient): An authenticated Google Sheets client.
         qdrant_client (QdrantClient): An initialized Qdrant vector store client.
+        max_workers (int): Maximum number of files promoted at the same time.
+        vectorstore (QdrantVectorStore, optional): A long-lived vectorstore to reuse, e.g. one
+            cached across Streamlit reruns. Initialized here if None.
 
     Returns:
         None. The function exits early if validation fails.
@@ -146,17 +178,65 @@ def promote_files(drive_client: DriveClient, sheets_client: SheetsClient, qdrant
     rejected_files = []
     failed_files = []
     
-    for idx, row in to_promote_df.iterrows():
-        if row.get("status") not in TARGET_STATUSES:
-            continue
-
-        result, pdf_id = upsert_single_file(drive_client, sheets_client, qdrant_client, row, row.name)
-        if result == "uploaded":
-            uploaded_files.append(pdf_id)
-        elif result == "rejected":
-            rejected_files.append(pdf_id)
-        elif result == "failed":
-            failed_files.append(pdf_id)
+    rows = [row for _, row in to_promote_df.iterrows() if row.get("status") in TARGET_STATUSES]
+    # Map each pdf_id to its sheet rows once instead of re-reading the sheet per file
+    rows_by_pdf_id = library_df.groupby(library_df["pdf_id"].astype(str)).groups
+    if rows and vectorstore is None:
+        vectorstore = init_vectorstore(qdrant_client)
+    # One Qdrant lookup for the whole batch instead of one per file
+    existing_pdf_ids = get_existing_pdf_ids(
+        qdrant_client, rag_config("qdrant_collection_name"), [str(row.get("pdf_id", "")) for row in rows]
+    ) if rows else set()
+
+    promoted_indices = {}
+    promoted_events = []
+
+    def upsert_in_worker(row):
+        return upsert_single_file(
+            get_thread_drive_client(drive_client), sheets_client, qdrant_client, row, row.name,
+            vectorstore=vectorstore,
+            existing_pdf_ids=existing_pdf_ids,
+        )
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [(executor.submit(upsert_in_worker, row), row) for row in rows]
+
+        for future, row in futures:
+            row_pdf_id = str(row.get("pdf_id", ""))
+            try:
+                result, pdf_id = future.result()
+            except Exception as e:
+                logging.error("Failed to promote %s: %s", row_pdf_id, e)
+                result, pdf_id = "failed", row_pdf_id
+
+            if result == "uploaded":
+                uploaded_files.append(pdf_id)
+                promoted_indices[pdf_id] = row.name
+                promoted_events.append({
+                    "action": "promoted_to_live",
+                    "pdf_id": str(pdf_id),
+                    "pdf_file_name": str(row.get("pdf_file_name", "")),
+                })
+            elif result == "rejected":
+                rejected_files.append(pdf_id)
+            elif result == "failed":
+                failed_files.append(pdf_id)
+
+    # Remove any other rows with the same pdf_id as a promoted row, in one pass
+    duplicate_indices = [
+        int(i) for pdf_id, keep_index in promoted_indices.items()
+        for i in rows_by_pdf_id.get(pdf_id, []) if i != keep_index
+    ]
+    if duplicate_indices:
+        try:
+            remove_rows(sheets_client, config["LIBRARY_UNIFIED"], duplicate_indices)
+            logging.info("Removed %s duplicate row(s) for promoted pdf_ids", len(duplicate_indices))
+        except Exception as dup_err:
+            logging.error("Failed to remove duplicate rows for promoted pdf_ids: %s", dup_err)
+
+    # Every promotion goes to the event log in one append, from this thread rather than the workers
+    if promoted_events:
+        log_events(sheets_client, promoted_events)
 
     logging.info("\n✅ Uploaded files:")
     for item in uploaded_files:
@@ -1,17 +1,21 @@
 
 from datetime import datetime, timezone
 import logging
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 from typing import List, Protocol, runtime_checkable
 from gspread.client import Client as SheetsClient
 from googleapiclient.discovery import Resource as DriveClient
 from env_config import env_config
 from utils.library_utils import compute_pdf_id, find_duplicates_against_reference, validate_core_metadata_format, append_new_rows
-from utils.gcp_utils import is_pdf_file, upload_pdf, fetch_sheet_as_df
-from utils.log_writer import log_event
+from utils.gcp_utils import is_pdf_file, upload_pdf, fetch_sheet_as_df, get_thread_drive_client
+from utils.log_writer import log_events
 
 config = env_config()
 
+# New PDFs are uploaded to PDF_TAGGING on this many threads
+MAX_CONCURRENT_UPLOADS = 8
+
 @runtime_checkable
 class FileLike(Protocol):
     """
@@ -59,6 +63,7 @@ def propose_new(drive_client: DriveClient, sheets_client: SheetsClient, uploaded
     failed_files = []
     duplicate_files = []
     collected_rows = []
+    events = []
 
     # Step 1: Precompute pdf_ids for valid uploaded PDFs
     file_map = {}
@@ -78,12 +83,15 @@ def propose_new(drive_client: DriveClient, sheets_client: SheetsClient, uploaded
             failed_files.append(file_name)
 
     # Step 2: Batch check for duplicates (existing sheet and within batch)
-    fields_to_check = [{"pdf_id": pdf_id} for pdf_id, _ in file_map.values()]
+    batch_df = pd.DataFrame(
+        [(file_name, pdf_id) for file_name, (pdf_id, _) in file_map.items()],
+        columns=["pdf_file_name", "pdf_id"],
+    )
     duplicate_pdf_ids = set()
     try:
         logging.info("Checking for duplicates.")
         duplicate_rows = find_duplicates_against_reference(
-            df_to_check=pd.DataFrame(fields_to_check),
+            df_to_check=batch_df[["pdf_id"]],
             reference_df=library_unified_df,
         )
         sheet_duplicate_ids = (
@@ -94,10 +102,7 @@ def propose_new(drive_client: DriveClient, sheets_client: SheetsClient, uploaded
         return pd.DataFrame(), [file.name for file in uploaded_files], []
 
     # Detect duplicates within the uploaded batch itself
-    pdf_id_counts = {}
-    for pdf_id, _ in file_map.values():
-        pdf_id_counts[pdf_id] = pdf_id_counts.get(pdf_id, 0) + 1
-    batch_duplicate_ids = {pid for pid, count in pdf_id_counts.items() if count > 1}
+    batch_duplicate_ids = set(batch_df.loc[batch_df["pdf_id"].duplicated(keep=False), "pdf_id"])
     duplicate_pdf_ids = sheet_duplicate_ids.union(batch_duplicate_ids)
 
     # Step 3: Log duplicates
@@ -112,51 +117,58 @@ def propose_new(drive_client: DriveClient, sheets_client: SheetsClient, uploaded
                     f"Duplicate detected: pdf_id '{pdf_id}' already exists in LIBRARY_UNIFIED ({file_name})"
                 )
             logging.warning(reason)
-            try:
-                log_event(
-                    sheets_client,
-                    "duplicate_skipped",
-                    str(pdf_id),
-                    str(file_name),
-                    extra_columns=[reason],
-                )
-            except Exception as log_error:
-                logging.error("⚠️ Failed to log duplicate_skipped event: %s", log_error)
+            events.append({
+                "action": "duplicate_skipped",
+                "pdf_id": str(pdf_id),
+                "pdf_file_name": str(file_name),
+                "extra_columns": [reason],
+            })
             duplicate_files.append(file_name)
 
     # Step 4: Upload and collect new rows
-    for file_name, (pdf_id, uploaded_file) in file_map.items():
-        if pdf_id in duplicate_pdf_ids:
-            continue  # Already handled
-
+    def upload_one(file_name: str, uploaded_file: FileLike):
+        # Each worker uses its own Drive client since uploads are independent of one another
+        uploaded_file.seek(0)
+        return upload_pdf(get_thread_drive_client(drive_client), uploaded_file, file_name, config["PDF_TAGGING"])
+
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_UPLOADS) as executor:
+        uploads = [
+            (file_name, pdf_id, executor.submit(upload_one, file_name, uploaded_file))
+            for file_name, (pdf_id, uploaded_file) in file_map.items()
+            if pdf_id not in duplicate_pdf_ids  # Duplicates already handled
+        ]
+
+    for file_name, pdf_id, upload in uploads:
         try:
-            uploaded_file.seek(0)
-            file_id = upload_pdf(drive_client, uploaded_file, file_name, config["PDF_TAGGING"])
-            file_link = f"https://drive.google.com/file/d/{file_id}/view"
+            file_id = upload.result()
 
             collected_rows.append({
                 "pdf_id": pdf_id,
                 "gcp_file_id": file_id,
-                "link": file_link,
                 "pdf_file_name": file_name,
-                "status": "new_for_tagging",
-                "status_timestamp": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
             })
 
-            log_event(
-                sheets_client,
-                "new_pdf_to_PDF_TAGGING",
-                str(pdf_id),
-                str(file_name),
-            )
+            events.append({
+                "action": "new_pdf_to_PDF_TAGGING",
+                "pdf_id": str(pdf_id),
+                "pdf_file_name": str(file_name),
+            })
 
         except Exception as e:
             logging.error("❌ Failed to process %s: %s", file_name, e)
             failed_files.append(file_name)
 
+    # Write all duplicate and upload events to the event log in one append
+    if events:
+        log_events(sheets_client, events)
+
     # Step 5: Validate metadata before writing
     new_rows_df = pd.DataFrame(collected_rows)
     if not new_rows_df.empty:
+        # Columns shared by the whole batch are filled in once
+        new_rows_df.insert(2, "link", "https://drive.google.com/file/d/" + new_rows_df["gcp_file_id"].astype(str) + "/view")
+        new_rows_df["status"] = "new_for_tagging"
+        new_rows_df["status_timestamp"] = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
         try:
             missing_columns = validate_core_metadata_format(new_rows_df)
             if missing_columns:
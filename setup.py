@@ -11,7 +11,7 @@ setup(
     install_requires=[
         # dependencies for gcp_utils.py
         "pandas",
-        "gspread>=5.8.3",
+        "gspread>=6.0",
         "google-api-python-client",
         "google-auth",
         "streamlit_authenticator"
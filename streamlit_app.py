@@ -1,4 +1,3 @@
-import base64
 import logging
 from typing import cast, List
 
@@ -21,11 +20,12 @@ from utils.qdrant_utils import (
     init_qdrant_client,
     get_unique_metadata_df,
     delete_records_by_pdf_id,
+    enable_scalar_quantization,
+    ensure_pdf_id_index,
 )
 from utils.gcp_utils import fetch_sheet_as_df
 from utils.library_utils import validate_all_rows_format
 from propose_new import propose_new, FileLike
-from promote import promote_files
 from cleanup import build_status_map, delete_tagged
 from ui_utils import init_auth, apply_styles
 
@@ -34,10 +34,35 @@ config = env_config()
 init_auth()
 apply_styles()
 
-creds = get_gcp_credentials()
-sheets_client = init_sheets_client(creds)
-drive_client = init_drive_client(creds)
-qdrant_client = init_qdrant_client("cloud")
+# Columns kept out of the Qdrant report editor and rows shown per table/editor page
+REPORT_HIDDEN_COLS = ["point_ids"]
+MAX_EDITOR_ROWS = 2000
+
+
+@st.cache_resource(show_spinner=False)
+def init_gcp_credentials_and_sheets():
+    creds = get_gcp_credentials()
+    return creds, init_sheets_client(creds)
+
+
+@st.cache_resource(show_spinner=False)
+def init_qdrant_client_cached() -> QdrantClient:
+    return init_qdrant_client("cloud")
+
+
+@st.cache_resource(show_spinner=False)
+def init_vectorstore_cached(_client: QdrantClient):
+    # LangChain/OpenAI imports take over a second, so load them only when promoting
+    from utils.langchain_utils import init_vectorstore
+    return init_vectorstore(_client)
+
+
+creds, sheets_client = init_gcp_credentials_and_sheets()
+# The httplib2 transport behind the Drive client isn't thread-safe, so each session builds its own
+if "drive_client" not in st.session_state:
+    st.session_state["drive_client"] = init_drive_client(creds)
+drive_client = st.session_state["drive_client"]
+qdrant_client = init_qdrant_client_cached()
 
 
 @st.cache_data(show_spinner=False)
@@ -45,6 +70,24 @@ def get_unique_metadata_df_cached(_client: QdrantClient, collection: str) -> pd.
     return get_unique_metadata_df(_client, collection)
 
 
+@st.cache_data(ttl=300, show_spinner="Loading LIBRARY_UNIFIED...")
+def fetch_sheet_as_df_cached(_client, spreadsheet_id: str) -> pd.DataFrame:
+    return fetch_sheet_as_df(_client, spreadsheet_id)
+
+
+@st.cache_data(show_spinner=False)
+def to_csv_bytes(df: pd.DataFrame) -> bytes:
+    return df.to_csv(index=False).encode("utf-8")
+
+
+def page_rows(df: pd.DataFrame, key: str) -> pd.DataFrame:
+    """Return one page of `df`, adding a page picker when it exceeds MAX_EDITOR_ROWS."""
+    if len(df) <= MAX_EDITOR_ROWS:
+        return df
+    num_pages = -(-len(df) // MAX_EDITOR_ROWS)
+    page = st.number_input("Page", min_value=1, max_value=num_pages, value=1, step=1, key=key)
+    return df.iloc[(int(page) - 1) * MAX_EDITOR_ROWS:int(page) * MAX_EDITOR_ROWS]
+
 
 st.write("")
 st.write("")
@@ -62,12 +105,16 @@ tabs = st.tabs([
 
 with tabs[0]:
     st.write("")
-    uploaded_files = st.file_uploader(
-        "Step 1: Choose PDF files to propose", type="pdf", accept_multiple_files=True)
-    if uploaded_files:
+    # Inside a form, picking files doesn't rerun propose_new; only Submit does
+    with st.form("propose_pdfs_form", clear_on_submit=True):
+        uploaded_files = st.file_uploader(
+            "Step 1: Choose PDF files to propose", type="pdf", accept_multiple_files=True)
+        submitted = st.form_submit_button("Propose PDFs")
+    if submitted and uploaded_files:
         with st.spinner("Uploading & scanning PDFs for duplicates..."):
             new_rows_df, failed_files, duplicate_files = propose_new(
                 drive_client, sheets_client, cast(List[FileLike], uploaded_files))
+            fetch_sheet_as_df_cached.clear()  # pyright: ignore[reportFunctionMemberAccess]
         if not new_rows_df.empty:
             st.success("Added new PDF(s)...")
             st.dataframe(new_rows_df)
@@ -99,7 +146,12 @@ with tabs[2]:
             config["DRY_RUN"] = str(dry_run)
             if st.button("Promote PDFs", key="promote_pdfs", type="secondary"):
                 with st.spinner("Promoting PDFs..."):
-                    promote_files(drive_client, sheets_client, qdrant_client)
+                    from promote import promote_files
+                    promote_files(
+                        drive_client, sheets_client, qdrant_client,
+                        vectorstore=init_vectorstore_cached(qdrant_client),
+                    )
+                    fetch_sheet_as_df_cached.clear()  # pyright: ignore[reportFunctionMemberAccess]
                 st.success("✅ Files promoted")
 
 with tabs[3]:
@@ -125,7 +177,10 @@ with tabs[3]:
         with content_col:
             if st.button("Validate rows format", key="validate_rows_format", type="secondary"):
                 with st.spinner("Searching rows, PDFs, and records..."):
-                    valid_df, invalid_df, log_df = validate_all_rows_format(sheets_client)
+                    # Read the Sheet fresh: rows are usually tagged by hand just before validating
+                    valid_df, invalid_df, log_df = validate_all_rows_format(
+                        fetch_sheet_as_df(sheets_client, config["LIBRARY_UNIFIED"])
+                    )
                 if invalid_df.empty:
                     st.success("✅ No invalid rows found.")
                 else:
@@ -141,6 +196,7 @@ with tabs[3]:
             if st.button("Remove flagged rows", key="remove_rows", type="secondary"):
                 with st.spinner("Searching rows, PDFs, and records..."):
                     rows_to_delete = delete_tagged(drive_client, sheets_client, qdrant_client)
+                    fetch_sheet_as_df_cached.clear()  # pyright: ignore[reportFunctionMemberAccess]
                 if rows_to_delete is None or rows_to_delete.empty:
                     st.info("No flagged rows found.")
                 else:
@@ -167,10 +223,43 @@ with tabs[3]:
                     with st.expander("🔍 Show Full Status Map"):
                         st.dataframe(status_df)
 
+    st.write("")
+    with st.container():
+        st.markdown("**Tune the Qdrant collection**")
+        indent_col, content_col = st.columns([0.05, 0.95])
+        with content_col:
+            if st.button(
+                "Enable scalar quantization",
+                key="enable_quantization",
+                type="secondary",
+                help="Keeps an int8 copy of every vector in RAM for search. Safe to run more than once.",
+            ):
+                with st.spinner("Updating Qdrant collection..."):
+                    quantized = enable_scalar_quantization(qdrant_client, RAG_CONFIG["qdrant_collection_name"])
+                if quantized:
+                    st.success("✅ Scalar quantization enabled.")
+                else:
+                    st.error("❌ Failed to enable scalar quantization. See logs.")
+            if st.button(
+                "Create pdf_id index",
+                key="pdf_id_index",
+                type="secondary",
+                help="Indexes metadata.pdf_id so lookups and deletes by pdf_id skip a full payload scan. "
+                     "Safe to run more than once.",
+            ):
+                with st.spinner("Updating Qdrant collection..."):
+                    indexed = ensure_pdf_id_index(qdrant_client, RAG_CONFIG["qdrant_collection_name"])
+                if indexed:
+                    st.success("✅ pdf_id payload index ready.")
+                else:
+                    st.error("❌ Failed to create the pdf_id payload index. See logs.")
+
 with tabs[4]:
     st.write("")
+    if st.button("Refresh library", key="refresh_library", type="secondary"):
+        fetch_sheet_as_df_cached.clear()  # pyright: ignore[reportFunctionMemberAccess]
     TARGET_STATUSES = ["live"]
-    library_unified_df = fetch_sheet_as_df(
+    library_unified_df = fetch_sheet_as_df_cached(
         sheets_client, config["LIBRARY_UNIFIED"])
     if library_unified_df is None or library_unified_df.empty:
         st.warning("⚠️ LIBRARY_UNIFIED sheet is empty or not accessible.")
@@ -189,7 +278,7 @@ with tabs[4]:
         f"**Unified Library:** {num_live_items_library} live items out of {num_items_library} total.")
 
     st.dataframe(
-        library_unified_df,
+        page_rows(library_unified_df, key="library_page") if library_unified_df is not None else None,
         height=510,
         column_config={
             "link": st.column_config.LinkColumn(
@@ -209,7 +298,9 @@ with tabs[5]:
     if metadata_df.empty:
         st.warning("⚠️ No data to display.")
     else:
-        df = metadata_df.copy()
+        # point_ids holds every record ID per row; keep it in the CSV but out of the editor
+        df = metadata_df.drop(columns=[c for c in REPORT_HIDDEN_COLS if c in metadata_df.columns])
+        df = page_rows(df, key="report_page")
         gcp_col = "gcp_file_id" if "gcp_file_id" in df.columns else "gcp_id" if "gcp_id" in df.columns else None
         order_cols = ["pdf_id"]
         if gcp_col:
@@ -217,7 +308,12 @@ with tabs[5]:
         df = df[[c for c in order_cols if c in df.columns] + [c for c in df.columns if c not in order_cols]]
         df.insert(0, "selected", False)
 
-        edited = st.data_editor(df, use_container_width=True, hide_index=False)
+        edited = st.data_editor(
+            df,
+            use_container_width=True,
+            hide_index=False,
+            disabled=[c for c in df.columns if c != "selected"],
+        )
 
         selected = edited[edited["selected"]]
         if st.button(
@@ -231,11 +327,13 @@ with tabs[5]:
             st.success("Selected points deleted from Qdrant")
 
         try:
-            csv_string = metadata_df.to_csv(index=False)
-            b64 = base64.b64encode(csv_string.encode("utf-8")).decode("utf-8")
-            file_name = "qdrant_metadata.csv"
-            link = f'<a href="data:file/csv;base64,{b64}" download="{file_name}">Download CSV</a>'
-            st.markdown(link, unsafe_allow_html=True)
+            # Served as a file by Streamlit rather than embedded in the page as base64
+            st.download_button(
+                "Download CSV",
+                data=to_csv_bytes(metadata_df),
+                file_name="qdrant_metadata.csv",
+                mime="text/csv",
+            )
         except Exception:
             logging.exception("Error exporting metadata to CSV")
             st.error("Failed to prepare download link.")
@@ -0,0 +1,69 @@
+import pandas as pd
+from unittest.mock import MagicMock
+
+import archive
+
+
+def test_archive_tagged_appends_and_removes_once(monkeypatch):
+    lib_df = pd.DataFrame({
+        'pdf_id': ['1', '2', '3'],
+        'gcp_file_id': ['a', 'b', 'c'],
+        'pdf_file_name': ['a.pdf', 'b.pdf', 'c.pdf'],
+        'status': ['live_for_archive', 'live', 'live_for_archive'],
+    })
+    monkeypatch.setattr(archive, 'config', {'LIBRARY_UNIFIED': 'lib', 'LIBRARY_ARCHIVE': 'arc', 'PDF_ARCHIVE': 'folder'})
+    monkeypatch.setattr(archive, 'fetch_sheet_as_df', lambda sc, sid: lib_df)
+    monkeypatch.setattr(archive, 'get_thread_drive_client', lambda dc: dc)
+    moved = []
+    monkeypatch.setattr(archive, 'move_file', lambda dc, fid, folder: moved.append(fid) or True)
+    qdrant_deletes = []
+    monkeypatch.setattr(archive, 'delete_records_by_pdf_id', lambda qc, col, ids: qdrant_deletes.append(ids))
+    monkeypatch.setattr(archive, 'rag_config', lambda key: 'col')
+    logged = []
+    monkeypatch.setattr(archive, 'log_events', lambda sc, events: logged.extend(events))
+    appended = []
+    monkeypatch.setattr(
+        archive, 'append_new_rows',
+        lambda sc, spreadsheet_id, new_rows_df, sheet_name: appended.append(new_rows_df) or list(new_rows_df['pdf_id']),
+    )
+    removed = []
+    monkeypatch.setattr(archive, 'remove_rows', lambda sc, spreadsheet_id, row_indices: removed.append(row_indices))
+
+    result = archive.archive_tagged(MagicMock(), MagicMock(), MagicMock())
+
+    assert len(appended) == 1 and list(appended[0]['pdf_id']) == ['1', '3']
+    assert removed == [[0, 2]]
+    assert sorted(moved) == ['a', 'c']
+    assert qdrant_deletes == [['1', '3']]
+    assert list(result['pdf_id']) == ['1', '3']
+    assert result['timestamp_archived'].nunique() == 1
+    assert [e['action'] for e in logged] == ['archived', 'archived']
+
+
+def test_archive_tagged_skips_rows_whose_move_failed(monkeypatch):
+    lib_df = pd.DataFrame({
+        'pdf_id': ['1', '2'],
+        'gcp_file_id': ['a', 'b'],
+        'pdf_file_name': ['a.pdf', 'b.pdf'],
+        'status': ['live_for_archive', 'live_for_archive'],
+    })
+    monkeypatch.setattr(archive, 'config', {'LIBRARY_UNIFIED': 'lib', 'LIBRARY_ARCHIVE': 'arc', 'PDF_ARCHIVE': 'folder'})
+    monkeypatch.setattr(archive, 'fetch_sheet_as_df', lambda sc, sid: lib_df)
+    monkeypatch.setattr(archive, 'get_thread_drive_client', lambda dc: dc)
+    monkeypatch.setattr(archive, 'move_file', lambda dc, fid, folder: fid != 'b')
+    qdrant_deletes = []
+    monkeypatch.setattr(archive, 'delete_records_by_pdf_id', lambda qc, col, ids: qdrant_deletes.append(ids))
+    monkeypatch.setattr(archive, 'rag_config', lambda key: 'col')
+    monkeypatch.setattr(archive, 'log_events', lambda sc, events: None)
+    monkeypatch.setattr(
+        archive, 'append_new_rows',
+        lambda sc, spreadsheet_id, new_rows_df, sheet_name: list(new_rows_df['pdf_id']),
+    )
+    removed = []
+    monkeypatch.setattr(archive, 'remove_rows', lambda sc, spreadsheet_id, row_indices: removed.append(row_indices))
+
+    result = archive.archive_tagged(MagicMock(), MagicMock(), MagicMock())
+
+    assert list(result['pdf_id']) == ['1']
+    assert qdrant_deletes == [['1']]
+    assert removed == [[0]]
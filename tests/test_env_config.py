@@ -13,6 +13,17 @@ def test_env_config_cli(monkeypatch):
     assert cfg["FORCE_USER_AUTH"] is False
 
 
+def test_env_config_loads_once_and_returns_copies(monkeypatch):
+    monkeypatch.setenv("RUN_CONTEXT", "cli")
+    module = importlib.reload(env_config)
+    first = module.env_config()
+    first["RUN_CONTEXT"] = "changed"
+    monkeypatch.setenv("RUN_CONTEXT", "streamlit")
+    assert module.env_config()["RUN_CONTEXT"] == "cli"
+    module._load_env_config.cache_clear()
+    assert module.env_config()["RUN_CONTEXT"] == "streamlit"
+
+
 def test_rag_config_missing_key():
     with pytest.raises(KeyError):
         env_config.rag_config("missing")
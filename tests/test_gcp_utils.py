@@ -33,6 +33,28 @@ def test_list_files_in_folder(mock_drive_client):
     assert df['URL'].iloc[0].startswith('https://drive.google.com/file/d/')
 
 
+def test_list_files_in_folder_checks_headers_only_when_mime_type_is_unclear(monkeypatch, mock_drive_client):
+    mock_drive_client.files.return_value.list.return_value.execute.return_value = {
+        'files': [
+            {'id': '1', 'name': 'one.pdf', 'mimeType': 'application/pdf'},
+            {'id': '2', 'name': 'doc', 'mimeType': 'application/vnd.google-apps.document'},
+            {'id': '3', 'name': 'three', 'mimeType': 'application/octet-stream'},
+        ],
+    }
+    headers = []
+    monkeypatch.setattr(gcp_utils, 'read_file_header', lambda dc, fid: headers.append(fid) or b'%PDF-')
+    df = gcp_utils.list_files_in_folder(mock_drive_client, 'folder', require_pdf=False)
+    assert list(df['ID']) == ['1', '3']
+    assert headers == ['3']
+
+
+def test_list_files_in_folder_empty(mock_drive_client):
+    mock_drive_client.files.return_value.list.return_value.execute.return_value = {'files': []}
+    df = gcp_utils.list_files_in_folder(mock_drive_client, 'folder')
+    assert df.empty
+    assert list(df.columns) == ['Name', 'ID', 'URL']
+
+
 def test_file_exists_true(mock_drive_client):
     mock_drive_client.files.return_value.get.return_value.execute.return_value = {'id': 'f'}
     assert gcp_utils.file_exists(mock_drive_client, 'f') is True
@@ -54,7 +76,7 @@ def test_fetch_sheet_as_df(monkeypatch, mock_sheets_client):
         ['1', '2'],
         ['3', '4'],
     ]
-    monkeypatch.setattr(gcp_utils, 'fetch_sheet', lambda sc, sid: sheet)
+    monkeypatch.setattr(gcp_utils, 'fetch_sheet', lambda sc, sid, **k: sheet)
     df = gcp_utils.fetch_sheet_as_df(mock_sheets_client, 'sheet')
     assert df.equals(pd.DataFrame({'a': ['1', '3'], 'b': ['2', '4']}))
 
@@ -71,10 +93,19 @@ def test_fetch_sheet_empty_duplicate(mock_sheets_client):
 
 
 
+def test_fetch_sheet_as_df_reads_values_once(mock_sheets_client):
+    sheet = MagicMock()
+    sheet.get_all_values.return_value = [['a'], ['1']]
+    mock_sheets_client.open_by_key.return_value.sheet1 = sheet
+    df = gcp_utils.fetch_sheet_as_df(mock_sheets_client, 'sheet')
+    assert list(df['a']) == ['1']
+    assert sheet.get_all_values.call_count == 1
+
+
 def test_fetch_sheet_as_df_none(monkeypatch, mock_sheets_client):
     sheet = MagicMock()
     sheet.get_all_values.return_value = []
-    monkeypatch.setattr(gcp_utils, 'fetch_sheet', lambda sc, sid: sheet)
+    monkeypatch.setattr(gcp_utils, 'fetch_sheet', lambda sc, sid, **k: sheet)
     df = gcp_utils.fetch_sheet_as_df(mock_sheets_client, 'sheet')
     assert df.empty
 
@@ -98,3 +129,158 @@ def test_get_gcp_credentials_bad_json(monkeypatch):
     monkeypatch.setitem(gcp_utils.config, "GCP_CREDENTIALS_FOR_STREAMLIT_USCGAUX_APP", "{bad}")
     with pytest.raises(ValueError):
         gcp_utils.get_gcp_credentials()
+
+
+def test_file_exists_reads_only_pdf_header(monkeypatch, mock_drive_client):
+    chunk_sizes = []
+
+    class FakeDownload:
+        def __init__(self, fh, request, chunksize):
+            self.fh = fh
+            chunk_sizes.append(chunksize)
+
+        def next_chunk(self):
+            self.fh.write(b'%PDF-1.7')
+            return None, False
+
+    monkeypatch.setattr(gcp_utils, 'MediaIoBaseDownload', FakeDownload)
+    mock_drive_client.files.return_value.get.return_value.execute.return_value = {'id': 'f'}
+
+    assert gcp_utils.file_exists(mock_drive_client, 'f') is True
+    assert chunk_sizes == [1024]
+
+
+def test_fetch_file_streams_in_chunks(monkeypatch, mock_drive_client):
+    chunk_sizes = []
+
+    class FakeDownload:
+        def __init__(self, fh, request, chunksize):
+            self.fh = fh
+            self.calls = 0
+            chunk_sizes.append(chunksize)
+
+        def next_chunk(self):
+            self.calls += 1
+            self.fh.write(b'%PDF-1.7' if self.calls == 1 else b' more')
+            return None, self.calls == 2
+
+    monkeypatch.setattr(gcp_utils, 'MediaIoBaseDownload', FakeDownload)
+
+    fh = gcp_utils.fetch_file(mock_drive_client, 'f')
+    assert fh is not None
+    assert fh.read() == b'%PDF-1.7 more'
+    assert chunk_sizes == [gcp_utils.DOWNLOAD_CHUNK_SIZE]
+
+
+def test_get_folder_names_uses_batched_requests(mock_drive_client):
+    responses = {
+        'f1': {'id': 'f1', 'parents': ['p1']},
+        'f2': {'id': 'f2', 'parents': ['p1']},
+        'p1': {'id': 'p1', 'name': 'PDF_LIVE'},
+    }
+    batches = []
+
+    class FakeBatch:
+        def __init__(self, callback):
+            self.callback = callback
+            self.ids = []
+            batches.append(self)
+
+        def add(self, request, request_id):
+            self.ids.append(request_id)
+
+        def execute(self):
+            for request_id in self.ids:
+                if request_id in responses:
+                    self.callback(request_id, responses[request_id], None)
+                else:
+                    self.callback(request_id, None, Exception('missing'))
+
+    mock_drive_client.new_batch_http_request.side_effect = lambda callback: FakeBatch(callback)
+
+    names = gcp_utils.get_folder_names(mock_drive_client, ['f1', 'f2', 'gone'])
+
+    assert names == {'f1': 'PDF_LIVE', 'f2': 'PDF_LIVE', 'gone': 'Unknown'}
+    assert [b.ids for b in batches] == [['f1', 'f2', 'gone'], ['p1']]
+
+
+def test_delete_files_batches_and_retries_transient_errors(mock_drive_client):
+    class Resp:
+        reason = 'error'
+
+        def __init__(self, status):
+            self.status = status
+
+    errors = {
+        'gone': HttpError(Resp(404), b''),
+        'busy': HttpError(Resp(503), b''),
+    }
+    batches = []
+
+    class FakeBatch:
+        def __init__(self, callback):
+            self.callback = callback
+            self.ids = []
+            batches.append(self)
+
+        def add(self, request, request_id):
+            self.ids.append(request_id)
+
+        def execute(self):
+            for request_id in self.ids:
+                self.callback(request_id, None, errors.get(request_id))
+
+    mock_drive_client.new_batch_http_request.side_effect = lambda callback: FakeBatch(callback)
+
+    results = gcp_utils.delete_files(mock_drive_client, ['f1', 'gone', 'busy', 'f1', ''])
+
+    assert [b.ids for b in batches] == [['f1', 'gone', 'busy']]
+    assert results['f1'] is None
+    assert results['gone'] is errors['gone']
+    # The 503 is retried once outside the batch and succeeds
+    assert results['busy'] is None
+    mock_drive_client.files.return_value.delete.return_value.execute.assert_called_once_with(
+        num_retries=gcp_utils.DRIVE_NUM_RETRIES
+    )
+
+
+def test_move_file_retries_transient_errors(mock_drive_client):
+    files = mock_drive_client.files.return_value
+    files.get.return_value.execute.return_value = {'parents': ['old']}
+    assert gcp_utils.move_file(mock_drive_client, 'f', 'new') is True
+    files.get.return_value.execute.assert_called_once_with(num_retries=gcp_utils.DRIVE_NUM_RETRIES)
+    files.update.return_value.execute.assert_called_once_with(num_retries=gcp_utils.DRIVE_NUM_RETRIES)
+
+
+@pytest.mark.parametrize("endpoint, code, expected_calls", [
+    ("https://sheets.googleapis.com/v4/spreadsheets/id/values/A1", 503, 3),
+    ("https://sheets.googleapis.com/v4/spreadsheets/id/values:batchUpdate", 408, 3),
+    ("https://sheets.googleapis.com/v4/spreadsheets/id/values/Sheet1:append", 503, 1),
+    ("https://sheets.googleapis.com/v4/spreadsheets/id:batchUpdate", 500, 1),
+    ("https://sheets.googleapis.com/v4/spreadsheets/id/values/Sheet1:append", 429, 3),
+])
+def test_sheets_retry_client_only_repeats_safe_requests(monkeypatch, endpoint, code, expected_calls):
+    from gspread.exceptions import APIError
+    from gspread.http_client import HTTPClient
+
+    resp = MagicMock()
+    resp.json.return_value = {"error": {"code": code, "message": "err", "status": "ERR"}}
+    calls = []
+
+    def flaky_request(self, method, url, *args, **kwargs):
+        calls.append(url)
+        if len(calls) < 3:
+            raise APIError(resp)
+        return "ok"
+
+    monkeypatch.setattr(HTTPClient, "request", flaky_request)
+    monkeypatch.setattr(gcp_utils.time, "sleep", lambda s: None)
+    from google.auth.credentials import AnonymousCredentials
+    client = gcp_utils.SheetsRetryHTTPClient(AnonymousCredentials())
+
+    if expected_calls == 3:
+        assert client.request("post", endpoint) == "ok"
+    else:
+        with pytest.raises(APIError):
+            client.request("post", endpoint)
+    assert len(calls) == expected_calls
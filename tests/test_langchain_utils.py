@@ -1,4 +1,5 @@
 import types
+from pathlib import Path
 from unittest.mock import MagicMock
 
 import pandas as pd
@@ -42,3 +43,54 @@ def test_chunk_docs(monkeypatch):
     cfg = {"chunk_size": 2, "chunk_overlap": 0, "length_function": len, "separators": [" "]}
     chunks = langchain_utils.chunk_Docs(docs, cfg)
     assert chunks == ["chunk1", "chunk2"]
+
+
+def test_upload_docs_streams_points_in_batches():
+    vs = MagicMock()
+    vs.vector_name = ""
+    vs.content_payload_key = "page_content"
+    vs.metadata_payload_key = "metadata"
+    vs.collection_name = "col"
+    vs.embeddings.embed_documents.side_effect = lambda texts: [[0.1, 0.2] for _ in texts]
+    sent = []
+    vs.client.upload_points.side_effect = lambda collection_name, points, batch_size, wait: sent.extend(points)
+
+    docs = [Document(page_content=str(i), metadata={"pdf_id": "p"}) for i in range(5)]
+    langchain_utils.upload_Docs(vs, docs, batch_size=2)
+
+    assert [p.payload["page_content"] for p in sent] == ["0", "1", "2", "3", "4"]
+    assert sent[0].payload["metadata"] == {"pdf_id": "p"}
+    assert vs.embeddings.embed_documents.call_count == 3
+
+
+def _image_only_pdf():
+    import io
+    from PIL import Image
+    buf = io.BytesIO()
+    Image.new("RGB", (200, 100), "white").save(buf, format="PDF")
+    buf.seek(0)
+    return buf
+
+
+@pytest.mark.parametrize("pdf_factory, expected_strategy", [
+    (lambda: (Path(__file__).parent / "lorem_ipsum.pdf").open("rb"), "fast"),
+    (_image_only_pdf, "auto"),
+])
+def test_pdf_to_docs_via_drive_uses_fast_only_with_a_text_layer(monkeypatch, pdf_factory, expected_strategy):
+    used = {}
+
+    class FakeLoader:
+        def __init__(self, file, mode, strategy):
+            used['strategy'] = strategy
+
+        def load(self):
+            return [Document(page_content="text", metadata={})]
+
+    monkeypatch.setattr(langchain_utils, 'fetch_file', lambda dc, fid: pdf_factory())
+    monkeypatch.setattr(langchain_utils, 'UnstructuredFileIOLoader', FakeLoader)
+    monkeypatch.setattr(langchain_utils, 'rag_config', lambda k: {'pdf_partition_strategy': 'fast'}[k])
+
+    docs = langchain_utils.pdf_to_Docs_via_Drive(MagicMock(), 'fid', pd.DataFrame([{'pdf_id': 'p'}]))
+
+    assert used['strategy'] == expected_strategy
+    assert docs[0].metadata['page_count'] >= 1
@@ -32,7 +32,118 @@ def test_fetch_rows_by_status():
     assert len(result) == 1
 
 
+def test_fetch_rows_by_status_repeated_and_mixed_case():
+    df = pd.DataFrame({'status': ['Live', 'live_archive', 'LIVE_archive', 'new', 'live_archive']})
+    result = library_utils.fetch_rows_by_status(df, ['Archive'])
+    assert list(result.index) == [1, 2, 4]
+
+
 def test_change_status_in_df():
     df = pd.DataFrame({'status': ['old', 'old', 'keep']})
     updated = library_utils.change_status_in_df(df, 'old', 'new')
     assert list(updated['status']) == ['new', 'new', 'keep']
+
+
+def test_find_duplicates_against_reference_by_fields():
+    ref = pd.DataFrame({
+        'pdf_id': ['1', '2', '3'],
+        'pdf_file_name': ['a.pdf', 'b.pdf', 'c.pdf'],
+        'status': ['live', 'live', 'new'],
+    })
+    result = library_utils.find_duplicates_against_reference(
+        ref,
+        fields_to_check=[
+            {'pdf_id': '1'},
+            {'pdf_file_name': 'c.pdf'},
+            {'pdf_id': '2', 'status': 'new'},
+        ],
+    )
+    assert list(result['pdf_id']) == ['1', '3']
+
+
+def test_remove_rows_deletes_contiguous_runs_in_one_batch():
+    from unittest.mock import MagicMock
+    client = MagicMock()
+    spreadsheet = client.open_by_key.return_value
+    spreadsheet.worksheet.return_value.id = 0
+    library_utils.remove_rows(client, 'sid', row_indices=[5, 0, 1, 2, 6])
+    spreadsheet.batch_update.assert_called_once()
+    ranges = [r['deleteDimension']['range'] for r in spreadsheet.batch_update.call_args.args[0]['requests']]
+    assert [(r['startIndex'], r['endIndex']) for r in ranges] == [(6, 8), (1, 4)]
+
+
+def test_append_new_rows_reads_only_header_row():
+    from unittest.mock import MagicMock
+    client = MagicMock()
+    sheet = client.open_by_key.return_value.worksheet.return_value
+    sheet.row_values.return_value = ['pdf_id', 'status']
+    new_rows = pd.DataFrame({'status': ['live'], 'pdf_id': ['1'], 'extra': ['x']})
+    appended = library_utils.append_new_rows(client, 'sid', new_rows)
+    sheet.append_rows.assert_called_once_with([['1', 'live']], value_input_option='RAW')
+    assert appended == [{'pdf_id': '1', 'status': 'live'}]
+    sheet.get_all_values.assert_not_called()
+
+
+def test_append_new_rows_restores_boolean_cells():
+    from unittest.mock import MagicMock
+    import numpy as np
+    client = MagicMock()
+    sheet = client.open_by_key.return_value.worksheet.return_value
+    sheet.row_values.return_value = ['pdf_id', 'checked', 'flag', 'native', 'note']
+    # Checkbox cells come back from get_all_values as "TRUE"/"FALSE" text
+    archived = pd.DataFrame({
+        'pdf_id': ['1'], 'checked': ['TRUE'], 'flag': ['false'], 'native': [np.bool_(True)], 'note': ['TRUE story'],
+    })
+    library_utils.append_new_rows(client, 'sid', archived)
+    sheet.append_rows.assert_called_once_with([['1', True, False, True, 'TRUE story']], value_input_option='RAW')
+
+
+def test_text_uuid5_matches_uuid5_of_joined_text():
+    import uuid
+    pages = ['Lorem ipsum ', '', 'dolor sit amet ✓']
+    assert library_utils._text_uuid5(pages) == str(uuid.uuid5(uuid.NAMESPACE_DNS, ''.join(pages)))
+    assert library_utils._text_uuid5([]) == str(uuid.uuid5(uuid.NAMESPACE_DNS, ''))
+
+
+def test_compute_pdf_id_parallel_matches_serial(monkeypatch):
+    from pathlib import Path
+    pdf_bytes = (Path(__file__).parent / 'lorem_ipsum.pdf').read_bytes()
+    serial_id = library_utils.compute_pdf_id(io.BytesIO(pdf_bytes))
+
+    monkeypatch.setattr(library_utils, 'PARALLEL_EXTRACT_MIN_PAGES', 1)
+    monkeypatch.setattr(library_utils, '_available_cpus', lambda: 2)
+    parallel_id = library_utils.compute_pdf_id(io.BytesIO(pdf_bytes))
+
+    assert parallel_id == serial_id
+    # Later calls reuse the same worker pool
+    pool = library_utils._extract_pool
+    assert library_utils.compute_pdf_id(io.BytesIO(pdf_bytes)) == serial_id
+    assert library_utils._extract_pool is pool
+
+
+def test_compute_pdf_id_falls_back_to_serial_when_parallel_fails(monkeypatch):
+    from pathlib import Path
+    pdf_bytes = (Path(__file__).parent / 'lorem_ipsum.pdf').read_bytes()
+    serial_id = library_utils.compute_pdf_id(io.BytesIO(pdf_bytes))
+
+    def failing_extract(pdf_bytes_io, num_pages):
+        raise ValueError('bad page range')
+
+    monkeypatch.setattr(library_utils, 'PARALLEL_EXTRACT_MIN_PAGES', 1)
+    monkeypatch.setattr(library_utils, '_available_cpus', lambda: 2)
+    monkeypatch.setattr(library_utils, '_extract_text_parallel', failing_extract)
+
+    assert library_utils.compute_pdf_id(io.BytesIO(pdf_bytes)) == serial_id
+
+
+def test_validate_all_rows_format_flags_bad_dates():
+    df = pd.DataFrame({
+        'pdf_id': ['1', '2'],
+        'pdf_file_name': ['a.pdf', 'b.pdf'],
+        'issue_date': ['2024-01-31T00:00:00Z', '01/31/2024'],
+        'aux_specific': ['true', 'false'],
+        'public_release': ['true', 'true'],
+    })
+    valid_df, invalid_df, _ = library_utils.validate_all_rows_format(df)
+    assert list(valid_df['pdf_id']) == ['1']
+    assert "issue_date='01/31/2024'" in invalid_df.iloc[0]['issues']
@@ -17,6 +17,23 @@ def test_upsert_single_file_rejected(monkeypatch):
     assert pid == '1'
 
 
+def test_upsert_single_file_uses_prefetched_pdf_ids(monkeypatch):
+    monkeypatch.setattr(promote, 'config', {'PDF_LIVE': 'live', 'LIBRARY_UNIFIED': 'lib'})
+    row = pd.Series({'pdf_id': '1', 'pdf_file_name': 'f.pdf', 'gcp_file_id': 'gid', 'status': 'new_tagged'})
+
+    def fail_in_qdrant(*a, **k):
+        raise AssertionError('in_qdrant should not be called')
+
+    monkeypatch.setattr(promote, 'in_qdrant', fail_in_qdrant)
+    monkeypatch.setattr(promote, 'file_exists', lambda *a, **k: True)
+
+    result, pid = promote.upsert_single_file(
+        MagicMock(), MagicMock(), MagicMock(), row, 0, existing_pdf_ids={'1'}
+    )
+
+    assert result == 'rejected'
+
+
 def test_upsert_single_file_success(monkeypatch):
     monkeypatch.setattr(promote, 'config', {'PDF_LIVE': 'live', 'LIBRARY_UNIFIED': 'lib'})
     row = pd.Series({'pdf_id': '2', 'pdf_file_name': 'g.pdf', 'gcp_file_id': 'gid', 'status': 'new_tagged'})
@@ -27,15 +44,77 @@ def test_upsert_single_file_success(monkeypatch):
     monkeypatch.setattr(promote, 'chunk_Docs', lambda docs, conf: ['chunk'])
     vec = MagicMock()
     monkeypatch.setattr(promote, 'init_vectorstore', lambda client: vec)
+    uploads = []
+    monkeypatch.setattr(promote, 'upload_Docs', lambda vs, chunks, batch_size: uploads.append((vs, chunks)))
     monkeypatch.setattr(promote, 'move_file', lambda *a, **k: None)
 
     sheet_mock = MagicMock()
-    monkeypatch.setattr(promote, 'fetch_sheet', lambda sc, sid: sheet_mock)
-    monkeypatch.setattr(promote, 'log_event', lambda *a, **k: None)
+    monkeypatch.setattr(promote, 'fetch_sheet', lambda sc, sid, **k: sheet_mock)
 
     result, pid = promote.upsert_single_file(MagicMock(), MagicMock(), MagicMock(), row, 1)
 
     assert result == 'uploaded'
     assert row['status'] == 'live'
-    assert sheet_mock.update.called
-    vec.add_documents.assert_called()
+    assert sheet_mock.batch_update.called
+    ranges = [u['range'] for u in sheet_mock.batch_update.call_args.args[0]]
+    assert ranges == ['D3', 'E3', 'F3']
+    assert uploads == [(vec, ['chunk'])]
+
+
+def test_promote_files_runs_rows_concurrently(monkeypatch):
+    lib_df = pd.DataFrame({
+        'pdf_id': ['1', '2', '3', '4'],
+        'status': ['new_tagged', 'clonedlive_tagged', 'new_tagged', 'live'],
+    })
+    monkeypatch.setattr(promote, 'config', {'PDF_LIVE': 'live', 'LIBRARY_UNIFIED': 'lib'})
+    monkeypatch.setattr(promote, 'fetch_sheet_as_df', lambda sc, sid: lib_df)
+    monkeypatch.setattr(promote, 'validate_all_rows_format', lambda df: (df, pd.DataFrame(), pd.DataFrame()))
+    monkeypatch.setattr(promote, 'find_duplicates_against_reference', lambda **kw: pd.DataFrame())
+    monkeypatch.setattr(promote, 'get_thread_drive_client', lambda dc: dc)
+    vec = MagicMock()
+    monkeypatch.setattr(promote, 'init_vectorstore', lambda client: vec)
+    monkeypatch.setattr(promote, 'get_existing_pdf_ids', lambda client, col, ids: {'2'})
+
+    def fake_upsert(drive_client, sheets_client, qdrant_client, row, idx, vectorstore=None, existing_pdf_ids=None):
+        assert vectorstore is vec
+        assert existing_pdf_ids == {'2'}
+        if row['pdf_id'] == '2':
+            return 'rejected', '2'
+        if row['pdf_id'] == '3':
+            raise RuntimeError('boom')
+        return 'uploaded', row['pdf_id']
+
+    monkeypatch.setattr(promote, 'upsert_single_file', fake_upsert)
+    log_calls = []
+    monkeypatch.setattr(promote, 'log_events', lambda sc, events: log_calls.append(events))
+
+    uploaded, failed, rejected = promote.promote_files(MagicMock(), MagicMock(), MagicMock(), max_workers=2)
+
+    assert uploaded == ['1']
+    assert rejected == ['2']
+    assert failed == ['3']
+    assert log_calls == [[{'action': 'promoted_to_live', 'pdf_id': '1', 'pdf_file_name': ''}]]
+
+
+def test_promote_files_removes_duplicate_rows_once(monkeypatch):
+    lib_df = pd.DataFrame({
+        'pdf_id': ['1', '2', '1'],
+        'status': ['live', 'new_tagged', 'new_tagged'],
+    })
+    monkeypatch.setattr(promote, 'config', {'PDF_LIVE': 'live', 'LIBRARY_UNIFIED': 'lib'})
+    monkeypatch.setattr(promote, 'fetch_sheet_as_df', lambda sc, sid: lib_df)
+    monkeypatch.setattr(promote, 'validate_all_rows_format', lambda df: (df, pd.DataFrame(), pd.DataFrame()))
+    monkeypatch.setattr(promote, 'find_duplicates_against_reference', lambda **kw: pd.DataFrame())
+    monkeypatch.setattr(promote, 'get_thread_drive_client', lambda dc: dc)
+    monkeypatch.setattr(promote, 'init_vectorstore', lambda client: MagicMock())
+    monkeypatch.setattr(promote, 'get_existing_pdf_ids', lambda client, col, ids: set())
+    monkeypatch.setattr(
+        promote, 'upsert_single_file', lambda *a, **k: ('uploaded', a[3]['pdf_id'])
+    )
+    removed = []
+    monkeypatch.setattr(promote, 'remove_rows', lambda sc, sid, indices: removed.append(list(indices)))
+    monkeypatch.setattr(promote, 'log_events', lambda sc, events: None)
+
+    promote.promote_files(MagicMock(), MagicMock(), MagicMock())
+
+    assert removed == [[0]]
@@ -22,10 +22,11 @@ def test_propose_and_promote(monkeypatch):
     monkeypatch.setattr(propose_new, 'config', {'LIBRARY_UNIFIED': 'lib', 'PDF_TAGGING': 'tag'})
     monkeypatch.setattr(propose_new, 'fetch_sheet_as_df', lambda sc, sid: pd.DataFrame({'pdf_id': []}))
     monkeypatch.setattr(propose_new, 'compute_pdf_id', lambda f: ids['pdf_id'])
+    monkeypatch.setattr(propose_new, 'get_thread_drive_client', lambda dc: dc)
     monkeypatch.setattr(propose_new, 'upload_pdf', lambda *a, **k: ids['gcp_file_id'])
     appended = []
     monkeypatch.setattr(propose_new, 'append_new_rows', lambda sc, sid, df: appended.append(df))
-    monkeypatch.setattr(propose_new, 'log_event', lambda *a, **k: None)
+    monkeypatch.setattr(propose_new, 'log_events', lambda *a, **k: None)
 
     new_rows, failed, dup = propose_new.propose_new(MagicMock(), MagicMock(), [pdf_file])
 
@@ -47,17 +48,19 @@ def test_propose_and_promote(monkeypatch):
     monkeypatch.setattr(promote, 'chunk_Docs', lambda *a, **k: ['chunk'])
     vec = MagicMock()
     monkeypatch.setattr(promote, 'init_vectorstore', lambda client: vec)
+    uploads = []
+    monkeypatch.setattr(promote, 'upload_Docs', lambda vs, chunks, batch_size: uploads.append((vs, chunks)))
     monkeypatch.setattr(promote, 'move_file', lambda *a, **k: None)
     sheet = MagicMock()
-    monkeypatch.setattr(promote, 'fetch_sheet', lambda sc, sid: sheet)
+    monkeypatch.setattr(promote, 'fetch_sheet', lambda sc, sid, **k: sheet)
     monkeypatch.setattr(promote, 'fetch_sheet_as_df', lambda sc, sid: pd.DataFrame([row_dict]))
     monkeypatch.setattr(promote, 'remove_rows', lambda *a, **k: None)
-    monkeypatch.setattr(promote, 'log_event', lambda *a, **k: None)
+    monkeypatch.setattr(promote, 'log_events', lambda *a, **k: None)
 
     result, pid = promote.upsert_single_file(MagicMock(), MagicMock(), MagicMock(), row, 0)
 
     assert result == 'uploaded'
     assert pid == ids['pdf_id']
     assert row['status'] == 'live'
-    assert sheet.update.called
-    vec.add_documents.assert_called()
+    assert sheet.batch_update.called
+    assert uploads == [(vec, ['chunk'])]
@@ -19,13 +19,14 @@ def test_propose_new_handles_duplicates(monkeypatch):
 
     monkeypatch.setattr(propose_new, 'fetch_sheet_as_df', fake_fetch_sheet_as_df)
     monkeypatch.setattr(propose_new, 'compute_pdf_id', lambda f: '1' if f.name == 'dup.pdf' else '2')
+    monkeypatch.setattr(propose_new, 'get_thread_drive_client', lambda dc: dc)
     monkeypatch.setattr(propose_new, 'upload_pdf', lambda *args, **kwargs: 'gfile')
 
     appended = []
     monkeypatch.setattr(propose_new, 'append_new_rows', lambda sc, sid, df: appended.append(df))
 
     events = []
-    monkeypatch.setattr(propose_new, 'log_event', lambda *args, **kwargs: events.append(args[1]))
+    monkeypatch.setattr(propose_new, 'log_events', lambda sc, evts: events.extend(e['action'] for e in evts))
 
     dup = make_file('dup.pdf')
     new = make_file('new.pdf')
@@ -34,6 +35,8 @@ def test_propose_new_handles_duplicates(monkeypatch):
     assert duplicates == ['dup.pdf']
     assert failed == []
     assert list(new_rows['pdf_file_name']) == ['new.pdf']
+    assert list(new_rows['link']) == ['https://drive.google.com/file/d/gfile/view']
+    assert list(new_rows['status']) == ['new_for_tagging']
     assert 'duplicate_skipped' in events and 'new_pdf_to_PDF_TAGGING' in events
 
 
@@ -21,9 +21,43 @@ def test_list_collections():
     assert qdrant_utils.list_collections(client) == ['test']
 
 
+def test_enable_scalar_quantization(mock_qdrant_client):
+    assert qdrant_utils.enable_scalar_quantization(mock_qdrant_client, 'col')
+    kwargs = mock_qdrant_client.update_collection.call_args.kwargs
+    assert kwargs['collection_name'] == 'col'
+    assert kwargs['quantization_config'].scalar.type == qdrant_utils.models.ScalarType.INT8
+
+
+def test_ensure_pdf_id_index(mock_qdrant_client):
+    assert qdrant_utils.ensure_pdf_id_index(mock_qdrant_client, 'col')
+    kwargs = mock_qdrant_client.create_payload_index.call_args.kwargs
+    assert kwargs['field_name'] == 'metadata.pdf_id'
+    assert kwargs['field_schema'] == qdrant_utils.models.PayloadSchemaType.KEYWORD
+
+
 def test_in_qdrant_true(mock_qdrant_client):
-    mock_qdrant_client.search.return_value = ['result']
+    record = MagicMock()
+    record.payload = {'metadata': {'pdf_id': 'id'}}
+    mock_qdrant_client.scroll.return_value = ([record], None)
     assert qdrant_utils.in_qdrant(mock_qdrant_client, 'col', 'id')
+    assert mock_qdrant_client.scroll.call_args.kwargs['limit'] == 1
+    assert not mock_qdrant_client.search.called
+
+
+def test_get_existing_pdf_ids_pages_until_all_found(mock_qdrant_client):
+    def record(pdf_id):
+        r = MagicMock()
+        r.payload = {'metadata': {'pdf_id': pdf_id}}
+        return r
+
+    mock_qdrant_client.scroll.side_effect = [
+        ([record('a'), record('a')], 'next'),
+        ([record('b')], 'more'),
+    ]
+    found = qdrant_utils.get_existing_pdf_ids(mock_qdrant_client, 'col', ['a', 'b', 'a'])
+    assert found == {'a', 'b'}
+    assert mock_qdrant_client.scroll.call_count == 2
+    assert mock_qdrant_client.scroll.call_args.kwargs['offset'] == 'next'
 
 
 def test_check_record_exists(mock_qdrant_client):
@@ -36,7 +70,18 @@ def test_get_all_pdf_ids_in_qdrant(mock_qdrant_client):
     record.payload = {'metadata': {'pdf_id': 'a'}}
     mock_qdrant_client.scroll.return_value = ([record], None)
     ids = qdrant_utils.get_all_pdf_ids_in_qdrant(mock_qdrant_client, 'col')
-    assert ids == ['a']
+    assert ids == frozenset({'a'})
+    assert mock_qdrant_client.scroll.call_args.kwargs['with_payload'] == ['metadata.pdf_id']
+
+
+def test_get_all_pdf_ids_in_qdrant_follows_pages(mock_qdrant_client):
+    first, second = MagicMock(), MagicMock()
+    first.payload = {'metadata': {'pdf_id': 'a'}}
+    second.payload = {'metadata': {'pdf_id': 'b'}}
+    mock_qdrant_client.scroll.side_effect = [([first], 'next'), ([second], None)]
+    ids = qdrant_utils.get_all_pdf_ids_in_qdrant(mock_qdrant_client, 'col')
+    assert ids == frozenset({'a', 'b'})
+    assert mock_qdrant_client.scroll.call_args.kwargs['offset'] == 'next'
 
 
 def test_delete_records_by_pdf_id(mock_qdrant_client):
@@ -47,6 +92,16 @@ def test_delete_records_by_pdf_id(mock_qdrant_client):
     assert mock_qdrant_client.delete.called
 
 
+def test_delete_records_by_pdf_id_chunks_large_batches(monkeypatch, mock_qdrant_client):
+    monkeypatch.setattr(qdrant_utils, 'DELETE_PDF_ID_CHUNK_SIZE', 2)
+    qdrant_utils.delete_records_by_pdf_id(mock_qdrant_client, 'col', ['a', 'b', 'c', 'a'])
+    chunks = [
+        call.kwargs['points_selector'].must[0].match.any
+        for call in mock_qdrant_client.delete.call_args_list
+    ]
+    assert chunks == [['a', 'b'], ['c']]
+
+
 def test_update_file_id_for_pdf_id(monkeypatch, mock_qdrant_client):
     calls = {}
 
@@ -163,3 +218,34 @@ def test_init_qdrant_client_missing_collection(monkeypatch):
     monkeypatch.setattr(qdrant_utils, "list_collections", lambda c: ["other"])
     with pytest.raises(ValueError):
         qdrant_utils.init_qdrant_client("cloud")
+
+
+def test_get_pdf_summaries_and_file_ids_single_scroll(monkeypatch, mock_qdrant_client):
+    rec1 = MagicMock()
+    rec1.id = "id1"
+    rec1.payload = {"metadata": {"pdf_id": "p1", "gcp_file_id": "f1", "title": "t"}}
+    rec2 = MagicMock()
+    rec2.id = "id2"
+    rec2.payload = {"metadata": {"pdf_id": "p1", "gcp_file_id": "f2"}}
+    rec3 = MagicMock()
+    rec3.id = "id3"
+    rec3.payload = {"metadata": {"pdf_id": "p2"}}
+    calls = []
+
+    def fake_scroll(**kwargs):
+        calls.append(kwargs)
+        return [rec1, rec2, rec3], None
+
+    monkeypatch.setattr(mock_qdrant_client, "scroll", fake_scroll)
+
+    summaries, files = qdrant_utils.get_pdf_summaries_and_file_ids(mock_qdrant_client, "col")
+
+    assert len(calls) == 1
+    assert calls[0]["scroll_filter"] is None
+    assert calls[0]["with_payload"] == ["metadata"]
+    summaries = summaries.set_index("pdf_id")
+    assert summaries.loc["p1", "record_count"] == 2
+    assert summaries.loc["p1", "point_ids"] == ["id1", "id2"]
+    files = files.set_index("pdf_id")
+    assert files.loc["p1", "gcp_file_ids"] == ["f1", "f2"]
+    assert files.loc["p2", "unique_file_count"] == 0
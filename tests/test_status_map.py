@@ -31,9 +31,8 @@ def test_build_status_map(monkeypatch):
     monkeypatch.setattr(cleanup, "rag_config", lambda k: "col")
     monkeypatch.setattr(cleanup, "fetch_sheet_as_df", lambda sc, sid: lib_df)
     monkeypatch.setattr(cleanup, "list_files_in_folder", lambda dc, fid: drive_df)
-    monkeypatch.setattr(cleanup, "get_summaries_by_pdf_id", lambda qc, col, ids: qsum_df[qsum_df.pdf_id.isin(ids)])
-    monkeypatch.setattr(cleanup, "get_gcp_file_ids_by_pdf_id", lambda qc, col, ids: qfile_df[qfile_df.pdf_id.isin(ids)])
-    monkeypatch.setattr(cleanup, "get_all_pdf_ids_in_qdrant", lambda qc, col: ["p1", "p3", "p_orphan"])
+    monkeypatch.setattr(cleanup, "get_thread_drive_client", lambda dc: dc)
+    monkeypatch.setattr(cleanup, "get_pdf_summaries_and_file_ids", lambda qc, col: (qsum_df, qfile_df))
 
     df, _ = cleanup.build_status_map(MagicMock(), MagicMock(), MagicMock())
 
@@ -57,3 +56,72 @@ def test_build_status_map(monkeypatch):
     assert "Orphan in Drive" in orphan["issues"]
 
 
+
+
+def test_flag_rows_as_orphans_writes_only_status_cells():
+    df = pd.DataFrame({
+        "pdf_id": ["a", "b", "c"],
+        "pdf_file_name": ["a.pdf", "b.pdf", "c.pdf"],
+        "status": ["live", "live", "live"],
+    })
+    sheet = MagicMock()
+    entries = cleanup.flag_rows_as_orphans(sheet, df, df[df["pdf_id"] == "c"])
+
+    updates = sheet.batch_update.call_args.args[0]
+    assert updates == [{"range": "C4", "values": [["orphan_row"]]}]
+    assert df.loc[2, "status"] == "orphan_row"
+    assert len(entries) == 1
+
+
+def test_flag_rows_as_orphans_merges_adjacent_rows():
+    df = pd.DataFrame({
+        "pdf_id": ["a", "b", "c", "d"],
+        "status": ["live", "live", "live", "live"],
+    })
+    sheet = MagicMock()
+    entries = cleanup.flag_rows_as_orphans(sheet, df, df[df["pdf_id"].isin(["a", "b", "d"])])
+
+    updates = sheet.batch_update.call_args.args[0]
+    assert updates == [
+        {"range": "B2:B3", "values": [["orphan_row"], ["orphan_row"]]},
+        {"range": "B5", "values": [["orphan_row"]]},
+    ]
+    assert len(entries) == 3
+
+
+def test_delete_tagged_skips_missing_drive_file(monkeypatch):
+    from googleapiclient.errors import HttpError
+
+    class FakeResp:
+        status = 404
+        reason = 'Not Found'
+
+    lib_df = pd.DataFrame({
+        "pdf_id": ["p1", "p2"],
+        "gcp_file_id": ["f1", "f2"],
+        "pdf_file_name": ["one.pdf", "two.pdf"],
+        "status": ["live_for_deletion", "live_for_deletion"],
+    })
+    drive = MagicMock()
+    monkeypatch.setattr(
+        cleanup, "delete_files",
+        lambda dc, ids: {i: (HttpError(FakeResp(), b'') if i == "f2" else None) for i in ids},
+    )
+    monkeypatch.setattr(cleanup, "config", {"LIBRARY_UNIFIED": "lib"})
+    monkeypatch.setattr(cleanup, "fetch_sheet_as_df", lambda sc, sid: lib_df)
+    monkeypatch.setattr(cleanup, "get_folder_names", lambda dc, ids: {i: "PDF_LIVE" for i in ids})
+    monkeypatch.setattr(cleanup, "rag_config", lambda key: "col")
+    deleted_ids = []
+    monkeypatch.setattr(cleanup, "delete_records_by_pdf_id", lambda qc, col, ids: deleted_ids.extend(ids))
+    removed = []
+    monkeypatch.setattr(cleanup, "remove_rows", lambda sc, spreadsheet_id, row_indices: removed.append(row_indices))
+    logged = []
+    monkeypatch.setattr(cleanup, "log_events", lambda sc, events: logged.extend(events))
+
+    result = cleanup.delete_tagged(drive, MagicMock(), MagicMock())
+
+    assert drive.files.return_value.get.call_count == 0
+    assert deleted_ids == ["p1", "p2"]
+    assert removed == [[0, 1]]
+    assert [e["action"] for e in logged] == ["file_deleted from PDF_LIVE", "deleted", "deleted"]
+    assert list(result["pdf_id"]) == ["p1", "p2"]
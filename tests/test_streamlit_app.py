@@ -25,15 +25,18 @@ def test_streamlit_app_runs(monkeypatch):
     )
     fake_qdrant_utils = types.SimpleNamespace(
         init_qdrant_client=lambda mode="cloud": MagicMock(),
-        get_all_pdf_ids_in_qdrant=lambda *a, **k: [],
+        get_all_pdf_ids_in_qdrant=lambda *a, **k: frozenset(),
         get_summaries_by_pdf_id=lambda *a, **k: pd.DataFrame(),
         get_gcp_file_ids_by_pdf_id=lambda *a, **k: pd.DataFrame(),
         delete_records_by_pdf_id=lambda *a, **k: None,
         get_unique_metadata_df=lambda *a, **k: pd.DataFrame(),
+        enable_scalar_quantization=lambda *a, **k: True,
+        ensure_pdf_id_index=lambda *a, **k: True,
     )
     fake_library_utils = types.SimpleNamespace(
         validate_all_rows_format=lambda *a, **k: (pd.DataFrame(), pd.DataFrame(), pd.DataFrame())
     )
+    fake_langchain_utils = types.SimpleNamespace(init_vectorstore=lambda client: MagicMock())
     fake_propose = types.SimpleNamespace(
         propose_new=lambda *a, **k: (pd.DataFrame(), [], []),
         FileLike=object,
@@ -49,6 +52,7 @@ def test_streamlit_app_runs(monkeypatch):
     monkeypatch.setitem(sys.modules, "utils.gcp_utils", fake_gcp_utils)
     monkeypatch.setitem(sys.modules, "utils.qdrant_utils", fake_qdrant_utils)
     monkeypatch.setitem(sys.modules, "utils.library_utils", fake_library_utils)
+    monkeypatch.setitem(sys.modules, "utils.langchain_utils", fake_langchain_utils)
     monkeypatch.setitem(sys.modules, "propose_new", fake_propose)
     monkeypatch.setitem(sys.modules, "promote", fake_promote)
     monkeypatch.setitem(sys.modules, "cleanup", fake_cleanup)
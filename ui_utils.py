@@ -9,8 +9,6 @@ import requests
 import pandas as pd
 import streamlit as st 
 from streamlit_authenticator import Authenticate
-from utils.gcp_utils import init_sheets_client, init_drive_client
-from utils.qdrant_utils import init_qdrant_client
 
 parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
@@ -115,57 +113,15 @@ FOOTER = """
 LOGO = "https://raw.githubusercontent.com/drew-wks/ASK/main/images/ASK_logotype_color.png?raw=true"
 
 
-def apply_styles():
-    st.markdown(COLLAPSED_CONTROL, unsafe_allow_html=True)
-    st.markdown(HIDE_STREAMLIT_UI, unsafe_allow_html=True)
-    st.markdown(BLOCK_CONTAINER_2, unsafe_allow_html=True)
-    st.image(LOGO, use_container_width=True)
+# Page styles sent to the browser as one markdown element
+APP_STYLES = COLLAPSED_CONTROL + HIDE_STREAMLIT_UI + BLOCK_CONTAINER_2
 
-# THIS DOES NOT WORK RIGHT NOW
-@st.cache_resource
-def init_cached_clients():
-    """
-    Initializes and returns cached instances of Google Drive, Google Sheets, and Qdrant clients.
-    Requires the following secrets to be set in `.streamlit/secrets.toml` or Streamlit Cloud:
-    - [gcp_service_account]
-    - qdrant_location
-
-    Returns:
-        Tuple: (drive_client, sheets_client, qdrant_client)
-    """
-    # --- Google clients ---
-    creds_info = st.secrets.get("gcp_service_account")
-    if not creds_info:
-        st.error("❌ Missing `[gcp_service_account]` in your secrets.")
-        st.stop()
-
-    try:
-        drive_client = init_drive_client(creds_info)
-    except Exception as e:
-        st.error(f"❌ Could not connect to Google Drive: {e}")
-        st.stop()
-
-    try:
-        sheets_client = init_sheets_client(creds_info)
-    except Exception as e:
-        st.error(f"❌ Could not connect to Google Sheets: {e}")
-        st.stop()
-
-    # --- Qdrant client ---
-    location = st.secrets.get("qdrant_location")
-    if not location:
-        st.error("❌ Missing `qdrant_location` in your secrets.")
-        st.stop()
 
-    try:
-        qdrant_client = init_qdrant_client(location)
-    except Exception as e:
-        st.error(f"❌ Could not connect to Qdrant: {e}")
-        st.stop()
+def apply_styles():
+    st.markdown(APP_STYLES, unsafe_allow_html=True)
+    st.image(LOGO, use_container_width=True)
 
-    return drive_client, sheets_client, qdrant_client
 
-    
 @st.cache_data
 def get_openai_api_status():
     '''Notify user if OpenAI is down so they don't blame the app'''
@@ -227,7 +183,16 @@ def find_catalog_directory() -> str | None:
     return None
 
 
-@st.cache_data
+# Timestamp embedded in catalog report filenames, e.g. docs_report_qdrant_cloud_2025-01-31T120000Z.xlsx
+_CATALOG_TIMESTAMP_RE = re.compile(r'docs_report_qdrant_cloud_(\d{4}-\d{2}-\d{2}T\d{6}Z)\.xlsx')
+
+
+@st.cache_data(show_spinner=False)
+def _read_catalog_excel(path: str, mtime_ns: int) -> pd.DataFrame:
+    """Parse a catalog workbook. `mtime_ns` is part of the cache key so an edited file is re-read."""
+    return pd.read_excel(path)
+
+
 def get_library_catalog_excel_and_date():
     """
     Retrieves the most recent Excel file matching the pattern 'docs_report_qdrant_cloud*.xlsx'
@@ -244,52 +209,46 @@ def get_library_catalog_excel_and_date():
         os.write(1, b"Directory 'docs/library_catalog' not found at either level.\n")
         return None, None
     
+    # Keep each DirEntry so the winner's mtime comes from the scan instead of another stat call
     try:
-        files_in_directory = os.listdir(directory_path)
+        with os.scandir(directory_path) as entries:
+            excel_files = [
+                entry for entry in entries
+                if entry.is_file() and fnmatch(entry.name, "docs_report_qdrant_cloud*.xlsx")
+            ]
     except FileNotFoundError:
         os.write(1, b"Directory not found.\n")
         return None, None
 
-    # Use fnmatch for filename matching
-    excel_files = [
-        f for f in files_in_directory
-        if fnmatch(f, "docs_report_qdrant_cloud*.xlsx")
-    ]
     if not excel_files:
         os.write(1, b"There is no matching Excel file in the directory.\n")
         return None, None
 
-    # Function to extract the timestamp from a filename.
-    def extract_timestamp(filename):
-        match = re.search(
-            r'docs_report_qdrant_cloud_(\d{4}-\d{2}-\d{2}T\d{6}Z)\.xlsx',
-            filename
-        )
-        if match:
-            date_str = match.group(1)
-            try:
-                return datetime.datetime.strptime(date_str, '%Y-%m-%dT%H%M%SZ')
-            except Exception:
-                return None
-        return None
-
-    # Build a list of tuples (filename, extracted_timestamp)
+    # The filename timestamp is zero-padded, so its string order is its chronological order.
+    # Only the most recent candidates need a datetime parse.
     excel_files_with_time = []
-    for file in excel_files:
-        ts = extract_timestamp(file)
-        if ts:
-            excel_files_with_time.append((file, ts))
-    
-    if not excel_files_with_time:
+    for entry in excel_files:
+        match = _CATALOG_TIMESTAMP_RE.search(entry.name)
+        if match:
+            excel_files_with_time.append((match.group(1), entry))
+    excel_files_with_time.sort(key=lambda x: x[0], reverse=True)
+
+    most_recent_file = file_timestamp = None
+    for date_str, entry in excel_files_with_time:
+        try:
+            file_timestamp = datetime.datetime.strptime(date_str, '%Y-%m-%dT%H%M%SZ')
+        except ValueError:
+            continue
+        most_recent_file = entry
+        break
+
+    if most_recent_file is None or file_timestamp is None:
         os.write(1, b"None of the Excel files have a valid timestamp in their filename.\n")
         return None, None
 
-    # Sort files by the extracted timestamp, most recent first
-    excel_files_with_time.sort(key=lambda x: x[1], reverse=True)
-    most_recent_file, file_timestamp = excel_files_with_time[0]
-
+    # Listing the directory is cheap; only the workbook parse is cached, keyed by path and mtime
     try:
-        df = pd.read_excel(os.path.join(directory_path, most_recent_file))
+        df = _read_catalog_excel(most_recent_file.path, most_recent_file.stat().st_mtime_ns)
     except Exception as e:
         os.write(1, f"Failed to read the Excel file: {e}\n".encode())
         return None, None
@@ -2,12 +2,17 @@
 
 import logging
 import json
-from typing import Optional
+import threading
+import time
+from http import HTTPStatus
+from typing import IO, Dict, Iterable, Optional
 from io import BytesIO
+from tempfile import SpooledTemporaryFile
 import pandas as pd
 import gspread
-from gspread_dataframe import get_as_dataframe
 from gspread.client import Client as SheetsClient
+from gspread.exceptions import APIError
+from gspread.http_client import HTTPClient
 from gspread.worksheet import Worksheet
 from google.oauth2.service_account import Credentials
 from googleapiclient.discovery import build, Resource as DriveClient
@@ -17,6 +22,52 @@ from env_config import env_config
 
 config = env_config()
 
+# Downloads stay in memory up to this size, then spill to a temp file on disk
+DOWNLOAD_SPOOL_MAX_SIZE = 8 << 20
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+# Drive accepts at most 100 calls in one batch HTTP request
+DRIVE_BATCH_LIMIT = 100
+# Idempotent Drive calls retry 429 and 5xx responses with exponential backoff
+DRIVE_NUM_RETRIES = 5
+# Sheets calls retry at most this many times, waiting 1, 2, 4, 8 s (15 s in all)
+SHEETS_NUM_RETRIES = 4
+SHEETS_RETRY_STATUSES = {HTTPStatus.REQUEST_TIMEOUT, HTTPStatus.TOO_MANY_REQUESTS}
+# Folder listings are scoped server-side by parent and MIME type and return only these fields
+PDF_MIME_TYPE = "application/pdf"
+DRIVE_LIST_FIELDS = "nextPageToken, files(id, name, mimeType)"
+
+_thread_local = threading.local()
+
+
+class SheetsRetryHTTPClient(HTTPClient):
+    """
+    gspread HTTP client that retries quota and transient server errors a bounded number of times.
+
+    Reads and value writes are safe to repeat, so they retry on 408, 429 and 5xx.
+    Appends and structural `spreadsheets:batchUpdate` calls (e.g. row deletes) are not:
+    a timeout or 5xx may arrive after the server applied the change, and a retry would
+    append the rows twice or delete the wrong rows. Those retry only on 429, which
+    Sheets returns before doing any work. Unlike gspread's `BackOffHTTPClient`, no retry
+    state is kept on the client, so it's safe to share across threads.
+    """
+
+    def request(self, method, endpoint, *args, **kwargs):
+        repeatable = not (
+            endpoint.endswith(":append")
+            or (endpoint.endswith(":batchUpdate") and not endpoint.endswith("/values:batchUpdate"))
+        )
+        for attempt in range(SHEETS_NUM_RETRIES + 1):
+            try:
+                return super().request(method, endpoint, *args, **kwargs)
+            except APIError as err:
+                transient = err.code in SHEETS_RETRY_STATUSES or err.code >= HTTPStatus.INTERNAL_SERVER_ERROR
+                if attempt == SHEETS_NUM_RETRIES or not (
+                    err.code == HTTPStatus.TOO_MANY_REQUESTS or (repeatable and transient)
+                ):
+                    raise
+                logging.warning("Sheets request failed with %s, retrying: %s", err.code, endpoint)
+                time.sleep(2 ** attempt)
+
 
 def get_gcp_credentials() -> Credentials:
     """
@@ -53,6 +104,34 @@ def init_drive_client(creds: Credentials) -> DriveClient:
     return client
 
 
+def get_thread_drive_client(drive_client: DriveClient) -> DriveClient:
+    """
+    Returns a Google Drive client owned by the calling thread.
+
+    The httplib2 transport behind `googleapiclient` is not thread-safe, so worker
+    threads must not share a Drive client. This builds one client per thread from
+    the credentials of the shared client and reuses it for later calls on that thread.
+    Falls back to the shared client if its credentials can't be read.
+
+    Args:
+        drive_client (DriveClient): The shared, authenticated Google Drive client.
+
+    Returns:
+        DriveClient: A Drive client safe to use from the current thread.
+    """
+    clients = getattr(_thread_local, "drive_clients", None)
+    if clients is None:
+        clients = _thread_local.drive_clients = {}
+
+    key = id(drive_client)
+    if key not in clients:
+        creds = getattr(getattr(drive_client, "_http", None), "credentials", None)
+        if creds is None:
+            return drive_client
+        clients[key] = build("drive", "v3", credentials=creds)
+    return clients[key]
+
+
 def init_sheets_client(creds: Credentials) -> SheetsClient:
     """
     Initializes a Google Sheets client using the provided credentials.
@@ -70,7 +149,8 @@ def init_sheets_client(creds: Credentials) -> SheetsClient:
         "https://spreadsheets.google.com/feeds",
         "https://www.googleapis.com/auth/drive",
     ])
-    client = gspread.authorize(scoped_creds)
+    # Retries quota (429) and transient errors with a capped backoff, without repeating appends
+    client = gspread.authorize(scoped_creds, http_client=SheetsRetryHTTPClient)
     logging.info("✅ Google Sheets client initialized successfully with scoped credentials.")
     return client
 
@@ -99,12 +179,119 @@ def get_folder_name(drive_client: DriveClient, file_id: str) -> str:
         return "Unknown"
 
 
-def is_pdf_file(file_stream: Optional[BytesIO]) -> bool:
+def get_files_metadata(
+    drive_client: DriveClient,
+    file_ids: Iterable[str],
+    fields: str = "id,name,parents",
+) -> Dict[str, dict]:
+    """
+    Fetch Drive metadata for many files using batched HTTP requests.
+
+    Sends up to `DRIVE_BATCH_LIMIT` `files.get` calls per round-trip instead of one
+    request per file. Files that don't exist or can't be read are left out.
+
+    Args:
+        drive_client: An authenticated Google Drive API client.
+        file_ids (Iterable[str]): IDs of the files to look up.
+        fields (str): Drive fields to return for each file.
+
+    Returns:
+        Dict[str, dict]: Metadata keyed by file ID.
+    """
+    unique_ids = list(dict.fromkeys(str(file_id) for file_id in file_ids if file_id))
+    results: Dict[str, dict] = {}
+
+    def callback(request_id, response, exception):
+        if exception is not None:
+            if getattr(getattr(exception, "resp", None), "status", None) != 404:
+                logging.warning("Error fetching metadata for file ID %s: %s", request_id, exception)
+            return
+        results[request_id] = response
+
+    for start in range(0, len(unique_ids), DRIVE_BATCH_LIMIT):
+        batch = drive_client.new_batch_http_request(callback=callback)
+        for file_id in unique_ids[start:start + DRIVE_BATCH_LIMIT]:
+            batch.add(drive_client.files().get(fileId=file_id, fields=fields), request_id=file_id)
+        batch.execute()
+
+    return results
+
+
+def delete_files(drive_client: DriveClient, file_ids: Iterable[str]) -> Dict[str, Optional[Exception]]:
+    """
+    Delete many Drive files using batched HTTP requests.
+
+    Sends up to `DRIVE_BATCH_LIMIT` `files.delete` calls per round-trip. Sub-requests
+    that fail with anything other than a 404 are retried once on their own with
+    `DRIVE_NUM_RETRIES`, since batch calls don't back off on transient errors.
+
+    Args:
+        drive_client: An authenticated Google Drive API client.
+        file_ids (Iterable[str]): IDs of the files to delete.
+
+    Returns:
+        Dict[str, Optional[Exception]]: The error for each file ID, None where the delete succeeded.
+    """
+    unique_ids = list(dict.fromkeys(str(file_id) for file_id in file_ids if file_id))
+    results: Dict[str, Optional[Exception]] = {}
+
+    def callback(request_id, response, exception):
+        results[request_id] = exception
+
+    for start in range(0, len(unique_ids), DRIVE_BATCH_LIMIT):
+        batch = drive_client.new_batch_http_request(callback=callback)
+        for file_id in unique_ids[start:start + DRIVE_BATCH_LIMIT]:
+            batch.add(drive_client.files().delete(fileId=file_id), request_id=file_id)
+        batch.execute()
+
+    for file_id, error in list(results.items()):
+        if error is None or getattr(getattr(error, "resp", None), "status", None) == 404:
+            continue
+        try:
+            drive_client.files().delete(fileId=file_id).execute(num_retries=DRIVE_NUM_RETRIES)
+            results[file_id] = None
+        except Exception as e:
+            results[file_id] = e
+
+    return results
+
+
+def get_folder_names(drive_client: DriveClient, file_ids: Iterable[str]) -> Dict[str, str]:
+    """
+    Returns the name of the folder containing each file, using batched Drive requests.
+
+    Batched equivalent of `get_folder_name`: one pass fetches every file's parents and
+    a second fetches the names of the distinct parent folders.
+
+    Args:
+        drive_client: An authenticated Google Drive API client.
+        file_ids (Iterable[str]): IDs of the files to look up.
+
+    Returns:
+        Dict[str, str]: Parent folder name keyed by file ID, "Unknown" where it can't be found.
+    """
+    file_ids = [str(file_id) for file_id in file_ids if file_id]
+    try:
+        files = get_files_metadata(drive_client, file_ids, fields="id,parents")
+        parent_ids = {fid: (meta.get("parents") or [None])[0] for fid, meta in files.items()}
+        folders = get_files_metadata(drive_client, filter(None, parent_ids.values()), fields="id,name")
+    except Exception as e:
+        logging.warning("Failed to fetch folder names for %s file(s): %s", len(file_ids), e)
+        return {file_id: "Unknown" for file_id in file_ids}
+
+    return {
+        file_id: folders.get(parent_ids.get(file_id) or "", {}).get("name", "Unknown")
+        for file_id in file_ids
+    }
+
+
+def is_pdf_file(file_stream: Optional[IO[bytes]]) -> bool:
     """Return True if the given stream appears to be a PDF file."""
     if not file_stream:
         return False
 
-    name = getattr(file_stream, "name", "").lower()
+    # Disk-backed temp files report an int file descriptor as their name
+    name = str(getattr(file_stream, "name", "")).lower()
     if name.endswith(".pdf"):
         return True
 
@@ -118,11 +305,34 @@ def is_pdf_file(file_stream: Optional[BytesIO]) -> bool:
         return False
     
 
+def read_file_header(drive_client: DriveClient, file_id: str, num_bytes: int = 1024) -> bytes:
+    """
+    Download only the first `num_bytes` of a file in Google Drive.
+
+    Sends a single ranged media request, so checking a file's type costs the same
+    for a 50 KB PDF as for a 50 MB one.
+
+    Args:
+        drive_client: An authenticated Google Drive API client.
+        file_id (str): The ID of the file to read.
+        num_bytes (int): Number of leading bytes to download.
+
+    Returns:
+        bytes: The leading bytes of the file.
+    """
+    fh = BytesIO()
+    request = drive_client.files().get_media(fileId=file_id)
+    MediaIoBaseDownload(fh, request, chunksize=num_bytes).next_chunk()
+    return fh.getvalue()
+
+
 def list_files_in_folder(drive_client, folder_id: str, require_pdf: bool = True) -> pd.DataFrame:
     """
     List files in a Google Drive folder as a DataFrame with columns: ['Name', 'ID', 'URL'].
 
-    If require_pdf=True (default), filters by MIME type. If False, checks file header for valid PDF.
+    If require_pdf=True (default), filters by MIME type in the Drive query. If False, files
+    whose MIME type is already PDF are kept, Google-native files are dropped, and only the
+    rest have their file header checked for a valid PDF.
 
     Args:
         drive_client: Authenticated Google Drive API client.
@@ -135,15 +345,15 @@ def list_files_in_folder(drive_client, folder_id: str, require_pdf: bool = True)
     try:
         query = f"'{folder_id}' in parents and trashed=false"
         if require_pdf:
-            query += " and mimeType='application/pdf'"
+            query += f" and mimeType='{PDF_MIME_TYPE}'"
 
         files = []
         page_token = None
         while True:
             resp = drive_client.files().list(
                 q=query,
-                fields="nextPageToken, files(id, name)",
-                pageSize=100,
+                fields=DRIVE_LIST_FIELDS,
+                pageSize=1000,
                 pageToken=page_token,
             ).execute()
             files.extend(resp.get("files", []))
@@ -151,24 +361,22 @@ def list_files_in_folder(drive_client, folder_id: str, require_pdf: bool = True)
             if not page_token:
                 break
 
-        df = pd.DataFrame(files).rename(columns={"id": "ID", "name": "Name"})
-        df["URL"] = df["ID"].apply(lambda x: f"https://drive.google.com/file/d/{x}/view")
+        df = pd.DataFrame(files, columns=["id", "name", "mimeType"]).rename(columns={"id": "ID", "name": "Name"})
+        df["URL"] = "https://drive.google.com/file/d/" + df["ID"] + "/view"
 
         if not require_pdf and not df.empty:
-            from io import BytesIO
-            from googleapiclient.http import MediaIoBaseDownload
-
-            def is_pdf(file_id: str) -> bool:
+            def is_pdf(file: pd.Series) -> bool:
+                if file["mimeType"] == PDF_MIME_TYPE:
+                    return True
+                # Docs, folders, shortcuts, etc. have no PDF bytes to download
+                if str(file["mimeType"]).startswith("application/vnd.google-apps."):
+                    return False
                 try:
-                    fh = BytesIO()
-                    request = drive_client.files().get_media(fileId=file_id)
-                    MediaIoBaseDownload(fh, request).next_chunk()
-                    fh.seek(0)
-                    return fh.read(5) == b"%PDF-"
+                    return is_pdf_file(BytesIO(read_file_header(drive_client, file["ID"])))
                 except Exception:
                     return False
 
-            df = df[df["ID"].apply(is_pdf)]
+            df = df[df.apply(is_pdf, axis=1)]
 
         return df[["Name", "ID", "URL"]]
 
@@ -178,9 +386,13 @@ def list_files_in_folder(drive_client, folder_id: str, require_pdf: bool = True)
 
     
 
-def fetch_file(drive_client, file_id: str, require_pdf: bool = True) -> Optional[BytesIO]:
+def fetch_file(drive_client, file_id: str, require_pdf: bool = True) -> Optional[IO[bytes]]:
     """
-    Download a file from Google Drive into memory as BytesIO.
+    Download a file from Google Drive into a spooled temporary file.
+
+    The file is streamed in `DOWNLOAD_CHUNK_SIZE` pieces and only stays in memory
+    up to `DOWNLOAD_SPOOL_MAX_SIZE`; larger files spill to disk. Callers should
+    close the returned file when done.
 
     Args:
         drive_client: An authenticated Google Drive API client.
@@ -188,12 +400,12 @@ def fetch_file(drive_client, file_id: str, require_pdf: bool = True) -> Optional
         require_pdf (bool): If True, the file must be a valid PDF or None is returned.
 
     Returns:
-        BytesIO: File content if successfully downloaded and (optionally) validated as a PDF; otherwise None.
+        IO[bytes]: File content, rewound, if successfully downloaded and (optionally) validated as a PDF; otherwise None.
     """
+    fh = SpooledTemporaryFile(max_size=DOWNLOAD_SPOOL_MAX_SIZE)
     try:
         request = drive_client.files().get_media(fileId=file_id)
-        fh = BytesIO()
-        downloader = MediaIoBaseDownload(fh, request)
+        downloader = MediaIoBaseDownload(fh, request, chunksize=DOWNLOAD_CHUNK_SIZE)
         done = False
         while not done:
             status, done = downloader.next_chunk()
@@ -201,21 +413,25 @@ def fetch_file(drive_client, file_id: str, require_pdf: bool = True) -> Optional
 
         if require_pdf and not is_pdf_file(fh):
             logging.warning("File ID %s is not a valid PDF", file_id)
+            fh.close()
             return None
 
         return fh
     except HttpError as e:
         logging.error("Failed to download file with ID %s: %s", file_id, e)
+        fh.close()
         return None
 
 
-def fetch_sheet(sheets_client: SheetsClient, spreadsheet_id: str) -> Worksheet | None:
+def fetch_sheet(sheets_client: SheetsClient, spreadsheet_id: str, check_empty: bool = True) -> Worksheet | None:
     """
     Fetches the first worksheet from a Google Sheet by ID.
 
     Args:
         sheets_client (GSpreadClient): An authenticated gspread client.
         spreadsheet_id (str): The ID of the Google Spreadsheet.
+        check_empty (bool): If True, reads the worksheet values and returns None when
+            it is empty. Callers that read the values themselves can skip this read.
 
     Returns:
         Worksheet: The first worksheet of the spreadsheet.
@@ -223,21 +439,15 @@ def fetch_sheet(sheets_client: SheetsClient, spreadsheet_id: str) -> Worksheet |
     """
     try:
         sheet = sheets_client.open_by_key(spreadsheet_id).sheet1
-        try:
-            if not sheet.get_all_values():
-                logging.error("Worksheet %s is empty.", spreadsheet_id)
-                return None
-        except Exception as inner:
-            logging.error("[fetch_sheet] Could not read worksheet %s values: %s", spreadsheet_id, inner)
-            return None
         logging.info(sheet.title)
-        try:
-            if not sheet.get_all_values():
-                logging.error("Worksheet %s is empty.", spreadsheet_id)
+        if check_empty:
+            try:
+                if not sheet.get_all_values():
+                    logging.error("Worksheet %s is empty.", spreadsheet_id)
+                    return None
+            except Exception as inner:
+                logging.error("[fetch_sheet] Could not read worksheet %s values: %s", spreadsheet_id, inner)
                 return None
-        except Exception as inner:
-            logging.error("[fetch_sheet] Could not read worksheet %s values: %s", spreadsheet_id, inner)
-            return None
         return sheet
     except Exception as e:
         logging.error("[fetch_sheet] Failed to fetch worksheet: %s", e)
@@ -260,7 +470,8 @@ def fetch_sheet_as_df(sheets_client: SheetsClient, spreadsheet_id: str) -> pd.Da
                       Returns empty DataFrame on failure or if no data rows exist.
     """
     try:
-        sheet = fetch_sheet(sheets_client, spreadsheet_id)
+        # The values read below also serve as the empty check, so the sheet is read once
+        sheet = fetch_sheet(sheets_client, spreadsheet_id, check_empty=False)
         if sheet is None:
             logging.error("❌ Worksheet %s could not be fetched.", spreadsheet_id)
             return pd.DataFrame()
@@ -334,7 +545,7 @@ def move_file(drive_client: DriveClient, file_id, target_folder_id):
     """
     try:
         # Retrieve the existing parents to remove
-        file = drive_client.files().get(fileId=file_id, fields='parents').execute()
+        file = drive_client.files().get(fileId=file_id, fields='parents').execute(num_retries=DRIVE_NUM_RETRIES)
         previous_parents = ",".join(file.get('parents'))
 
         # Move the file to the new folder
@@ -343,7 +554,7 @@ def move_file(drive_client: DriveClient, file_id, target_folder_id):
             addParents=target_folder_id,
             removeParents=previous_parents,
             fields='id, parents'
-        ).execute()
+        ).execute(num_retries=DRIVE_NUM_RETRIES)
         return True
     except Exception as e:
         logging.error("Failed to move file %s to folder %s: %s", file_id, target_folder_id, e)
@@ -367,17 +578,9 @@ def file_exists(drive_client, file_id: str, require_pdf: bool = True) -> bool:
         if not require_pdf:
             return True
 
-        # Fetch and validate as PDF
+        # Fetch the first bytes and validate as PDF
         try:
-            request = drive_client.files().get_media(fileId=file_id)
-            fh = BytesIO()
-            downloader = MediaIoBaseDownload(fh, request)
-            done = False
-            while not done:
-                _, done = downloader.next_chunk()
-            fh.seek(0)
-
-            if not is_pdf_file(fh):
+            if not is_pdf_file(BytesIO(read_file_header(drive_client, file_id))):
                 logging.warning("File ID %s exists but is not a valid PDF", file_id)
                 return False
         except Exception as e:
@@ -1,10 +1,11 @@
 #  Utilities for langchain
 
 import logging
-from typing import List, Dict, Any
-from io import BytesIO
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Iterator
 import pandas as pd
-from qdrant_client import QdrantClient
+from qdrant_client import QdrantClient, models
 import pypdf
 from langchain_community.document_loaders.unstructured import UnstructuredFileIOLoader
 from langchain.schema import Document
@@ -14,6 +15,7 @@ from langchain_qdrant import QdrantVectorStore
 from googleapiclient.discovery import Resource
 
 from env_config import rag_config
+from utils.gcp_utils import fetch_file
 
 
 def init_vectorstore(client: QdrantClient) -> QdrantVectorStore:
@@ -64,21 +66,27 @@ def pdf_to_Docs_via_Drive(
         raise ValueError("metadata_df must contain exactly one row")
     metadata_dict = metadata_df.iloc[0].to_dict()
 
-    try:
-        # Download PDF into memory
-        request = drive_client.files().get_media(fileId=file_id)
-        file_bytes = BytesIO()
-        request.execute(fd=file_bytes)
-        file_bytes.seek(0)
-
-        # Load via UnstructuredFileIOLoader
-        loader = UnstructuredFileIOLoader(file_bytes, mode="elements")
-        docs = loader.load()
+    # Stream the PDF into a spooled temp file rather than one in-memory buffer
+    file_bytes = fetch_file(drive_client, file_id)
+    if file_bytes is None:
+        logging.error("Failed to download PDF from Drive (file_id=%s)", file_id)
+        return docs_pages
 
-        # Extract page count metadata via pypdf
-        file_bytes.seek(0)
+    try:
+        # Extract page count metadata via pypdf, and check for a text layer on the way
         reader = pypdf.PdfReader(file_bytes)
         metadata_dict["page_count"] = len(reader.pages)
+        has_text_layer = any((page.extract_text() or "").strip() for page in reader.pages)
+
+        # Load via UnstructuredFileIOLoader. The configured strategy ("fast") only reads the
+        # text layer, so scanned or image-only PDFs go through "auto" and its OCR fallback.
+        file_bytes.seek(0)
+        loader = UnstructuredFileIOLoader(
+            file_bytes,
+            mode="elements",
+            strategy=rag_config("pdf_partition_strategy") if has_text_layer else "auto",
+        )
+        docs = loader.load()
 
         # Update metadata on each doc
         for doc in docs:
@@ -89,6 +97,8 @@ def pdf_to_Docs_via_Drive(
 
     except Exception as e:
         logging.error("Failed to process PDF from Drive (file_id=%s): %s", file_id, e)
+    finally:
+        file_bytes.close()
 
     return docs_pages
 
@@ -112,10 +122,10 @@ def chunk_Docs(
         Exception: If any error occurs during chunking.
     """
     try:
-        chunk_size=RAG_CONFIG["chunk_size"],
-        chunk_overlap=RAG_CONFIG["chunk_overlap"],
-        length_function=RAG_CONFIG["length_function"],
-        separators=RAG_CONFIG["separators"]
+        chunk_size = RAG_CONFIG["chunk_size"]
+        chunk_overlap = RAG_CONFIG["chunk_overlap"]
+        length_function = RAG_CONFIG["length_function"]
+        separators = RAG_CONFIG["separators"]
     except KeyError as e:
         logging.error("Missing required RAG_CONFIG key: %s", e)
         raise
@@ -136,3 +146,61 @@ def chunk_Docs(
         logging.error("Failed to chunk documents: %s", e)
         raise
 
+
+
+def upload_Docs(
+    vectorstore: QdrantVectorStore,
+    docs_chunks: List[Document],
+    batch_size: int = 64,
+) -> None:
+    """
+    Embeds chunked Documents and streams them to Qdrant as they are embedded.
+
+    Points are produced lazily by a generator and sent with `upload_points`, so at
+    most two batches are held in memory. The next batch is embedded on a background
+    thread while the current one is being upserted. Payloads match what
+    QdrantVectorStore.add_documents writes, so retrieval is unaffected.
+
+    Args:
+        vectorstore (QdrantVectorStore): Initialized vectorstore supplying the client,
+            collection, embeddings and payload keys.
+        docs_chunks (List[Document]): Chunked Document objects to upload.
+        batch_size (int): Chunks embedded and upserted per request.
+
+    Raises:
+        Exception: If embedding or upload fails.
+    """
+    def embed(batch: List[Document]) -> List[List[float]]:
+        return vectorstore.embeddings.embed_documents([doc.page_content for doc in batch])
+
+    def points() -> Iterator[models.PointStruct]:
+        batches = [docs_chunks[i:i + batch_size] for i in range(0, len(docs_chunks), batch_size)]
+        if not batches:
+            return
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            pending = executor.submit(embed, batches[0])
+            for i, batch in enumerate(batches):
+                vectors = pending.result()
+                if i + 1 < len(batches):
+                    pending = executor.submit(embed, batches[i + 1])
+                for doc, vector in zip(batch, vectors):
+                    yield models.PointStruct(
+                        id=uuid.uuid4().hex,
+                        vector={vectorstore.vector_name: vector},
+                        payload={
+                            vectorstore.content_payload_key: doc.page_content,
+                            vectorstore.metadata_payload_key: doc.metadata,
+                        },
+                    )
+
+    try:
+        vectorstore.client.upload_points(
+            collection_name=vectorstore.collection_name,
+            points=points(),
+            batch_size=batch_size,
+            wait=True,
+        )
+        logging.info("Uploaded %s chunks to collection '%s'.", len(docs_chunks), vectorstore.collection_name)
+    except Exception as e:
+        logging.error("Failed to upload chunks to Qdrant: %s", e)
+        raise
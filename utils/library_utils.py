@@ -1,10 +1,103 @@
+import hashlib
 import logging
+import multiprocessing
+import os
+import threading
 import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
 from datetime import datetime, timezone
-from typing import Optional, Dict, List, Union
+from typing import Optional, Dict, Iterable, List, Tuple, Union
+import numpy as np
 import pandas as pd
 from pypdf import PdfReader
-from utils.gcp_utils import fetch_sheet_as_df  
+
+
+# PDFs with at least this many pages have their text extracted across processes. Serial
+# pypdf extraction runs ~40 ms/page, while a cold spawned worker (interpreter start plus
+# importing this module) costs ~0.3 s, so even a cold pool pays off from ~15 pages on
+# two CPUs; 50 leaves headroom for pickling the PDF bytes and slower hosts.
+PARALLEL_EXTRACT_MIN_PAGES = 50
+
+# One spawned pool per process, created on first use and reused by later calls
+_extract_pool: Optional[ProcessPoolExecutor] = None
+_extract_pool_lock = threading.Lock()
+
+
+def _available_cpus() -> int:
+    """Return the CPUs this process may run on, honouring its affinity mask where supported."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # macOS and Windows have no sched_getaffinity
+        return os.cpu_count() or 1
+
+
+def _get_extract_pool() -> ProcessPoolExecutor:
+    """Return the shared text extraction pool, creating it on first use."""
+    global _extract_pool
+    with _extract_pool_lock:
+        if _extract_pool is None:
+            _extract_pool = ProcessPoolExecutor(
+                max_workers=_available_cpus(), mp_context=multiprocessing.get_context("spawn")
+            )
+        return _extract_pool
+
+
+def _extract_text_range(pdf_bytes: bytes, start: int, end: int) -> str:
+    """Extract and join the text of pages [start, end). Runs in a worker process."""
+    logging.getLogger("pypdf").setLevel(logging.ERROR)
+    reader = PdfReader(BytesIO(pdf_bytes))
+    return "".join(reader.pages[i].extract_text() or "" for i in range(start, end))
+
+
+def _extract_text_parallel(pdf_bytes_io, num_pages: int) -> List[str]:
+    """
+    Extract a PDF's text by splitting its pages into contiguous ranges, one per worker.
+
+    pypdf extraction is CPU-bound pure Python, so threads don't help. Ranges are
+    returned in page order, so joining them gives the same text as a serial pass.
+    Workers are spawned rather than forked because callers such as the Streamlit
+    server are multi-threaded, and a forked child can deadlock on a copied lock.
+    The pool is kept between calls so the spawn and import cost is paid once.
+
+    Args:
+        pdf_bytes_io (BytesIO): In-memory bytes buffer containing the PDF data.
+        num_pages (int): Number of pages in the PDF.
+
+    Returns:
+        List[str]: The text of each page range, in page order.
+    """
+    global _extract_pool
+    workers = min(_available_cpus(), num_pages)
+    step = -(-num_pages // workers)
+    starts = list(range(0, num_pages, step))
+    ends = [min(start + step, num_pages) for start in starts]
+
+    pdf_bytes_io.seek(0)
+    pdf_bytes = pdf_bytes_io.read()
+    pool = _get_extract_pool()
+    try:
+        return list(pool.map(_extract_text_range, [pdf_bytes] * len(starts), starts, ends))
+    except BrokenProcessPool:
+        # A dead worker breaks the whole pool; drop it so the next call starts a fresh one
+        with _extract_pool_lock:
+            if _extract_pool is pool:
+                _extract_pool = None
+        raise
+
+
+def _text_uuid5(texts: Iterable[str]) -> str:
+    """
+    Return `uuid5(NAMESPACE_DNS, "".join(texts))` without building the joined string.
+
+    The SHA-1 behind uuid5 is fed one piece at a time, so only one page's text
+    is held in memory at once. The result is identical to calling uuid5 directly.
+    """
+    digest = hashlib.sha1(uuid.NAMESPACE_DNS.bytes)
+    for text in texts:
+        digest.update(text.encode("utf-8"))
+    return str(uuid.UUID(bytes=digest.digest()[:16], version=5))
 
 
 def compute_pdf_id(pdf_bytes_io):
@@ -21,10 +114,17 @@ def compute_pdf_id(pdf_bytes_io):
         logging.getLogger("pypdf").setLevel(logging.ERROR)
         pdf_bytes_io.seek(0)
         reader = PdfReader(pdf_bytes_io)
-        full_text = ""
-        for page in reader.pages:
-            full_text += page.extract_text() or ""
-        pdf_uuid = str(uuid.uuid5(uuid.NAMESPACE_DNS, full_text))
+        num_pages = len(reader.pages)
+        page_texts = None
+        if num_pages >= PARALLEL_EXTRACT_MIN_PAGES and _available_cpus() > 1:
+            try:
+                page_texts = _extract_text_parallel(pdf_bytes_io, num_pages)
+            except Exception as e:
+                # Any worker failure (pool start-up, pickling, pypdf) gets a serial retry before giving up
+                logging.warning("Parallel text extraction failed, falling back to serial: %s", e)
+        if page_texts is None:
+            page_texts = (page.extract_text() or "" for page in reader.pages)
+        pdf_uuid = _text_uuid5(page_texts)
         return pdf_uuid
     except Exception as e:
         logging.warning("Error computing PDF ID: %s", e)
@@ -48,6 +148,15 @@ def validate_core_metadata_format(df):
     return missing_columns
 
 
+def _is_iso_utc(value: str) -> bool:
+    """Return True if value is an ISO 8601 UTC timestamp like 2024-01-31T12:00:00Z."""
+    try:
+        datetime.strptime(value, "%Y-%m-%dT%H:%M:%SZ")
+        return True
+    except ValueError:
+        return False
+
+
 def validate_all_rows_format(df):
     """
     Validates all rows in the dataframe regardless of status.
@@ -77,6 +186,12 @@ def validate_all_rows_format(df):
             df[field] = df[field].fillna("")
             
             
+    # Parse each distinct date value once per column instead of once per row
+    bad_date_values = {
+        f: {v for v in df[f].astype(str).str.strip().unique() if v and not _is_iso_utc(v)}
+        for f in date_fields if f in df.columns
+    }
+
     valid_rows = []
     invalid_rows = []
     log_entries = []
@@ -120,11 +235,8 @@ def validate_all_rows_format(df):
         bad_dates = []
         for f in date_fields:
             val = str(row.get(f, "")).strip()
-            if val:
-                try:
-                    datetime.strptime(val, "%Y-%m-%dT%H:%M:%SZ")
-                except ValueError:
-                    bad_dates.append(f"{f}='{val}'")
+            if val in bad_date_values.get(f, ()):
+                bad_dates.append(f"{f}='{val}'")
         if bad_dates:
             issues.append(f"invalid_date_format: {bad_dates}")
             row_valid = False
@@ -221,21 +333,43 @@ def find_duplicates_against_reference(
         if isinstance(fields_to_check, dict):
             fields_to_check = [fields_to_check]
 
-        matches = []
+        # Single-field criteria are pooled into one isin() per field; each column
+        # is cast to str once instead of once per criteria.
+        values_by_field: Dict[str, set] = {}
+        multi_field_criteria = []
         for criteria in fields_to_check:
-            filtered_ref = reference_df.copy()
+            active = {}
             for field, value in criteria.items():
                 if not value or str(value).strip() == "":
                     continue
                 if field not in reference_df.columns:
                     logging.warning("Field '%s' not found in reference_df. Skipping.", field)
                     continue
-                filtered_ref = filtered_ref[filtered_ref[field].astype(str) == str(value).strip()]
-            if not filtered_ref.empty:
-                matches.append(filtered_ref)
-
-        if matches:
-            result = pd.concat(matches).drop_duplicates()
+                active[field] = str(value).strip()
+            if len(active) == 1:
+                field, value = next(iter(active.items()))
+                values_by_field.setdefault(field, set()).add(value)
+            else:
+                multi_field_criteria.append(active)
+
+        str_columns: Dict[str, pd.Series] = {}
+
+        def str_column(field: str) -> pd.Series:
+            if field not in str_columns:
+                str_columns[field] = reference_df[field].astype(str)
+            return str_columns[field]
+
+        match_mask = pd.Series(False, index=reference_df.index)
+        for field, values in values_by_field.items():
+            match_mask |= str_column(field).isin(values)
+        for active in multi_field_criteria:
+            criteria_mask = pd.Series(True, index=reference_df.index)
+            for field, value in active.items():
+                criteria_mask &= str_column(field) == value
+            match_mask |= criteria_mask
+
+        if match_mask.any():
+            result = reference_df[match_mask].drop_duplicates()
             logging.warning("⚠️ %s duplicates found based on provided field(s).", len(result))
             return result
         logging.info("✅ No duplicates found based on provided field(s).")
@@ -318,8 +452,10 @@ def fetch_rows_by_status(catalog_df, keywords):
     if isinstance(keywords, str):
         keywords = [keywords]
 
-    # Build combined match mask
-    match_mask = status_series.apply(lambda x: any(kw.lower() in x for kw in keywords))
+    # Statuses repeat heavily, so match each distinct value once and map back
+    keywords = [kw.lower() for kw in keywords]
+    matching = {s for s in status_series.unique() if any(kw in s for kw in keywords)}
+    match_mask = status_series.isin(matching)
     matched_rows = catalog_df[match_mask]
 
     logging.info("Found %s rows matching keywords: %s", len(matched_rows), keywords)
@@ -360,6 +496,25 @@ def change_status_in_df(
     return df_copy
 
 
+def contiguous_runs(row_indices: Iterable[int]) -> List[Tuple[int, int]]:
+    """
+    Collapse row indices into sorted, inclusive (first, last) runs of consecutive rows.
+
+    Args:
+        row_indices: Row indices in any order; duplicates are ignored.
+
+    Returns:
+        List[Tuple[int, int]]: One (first, last) pair per run, in ascending order.
+    """
+    runs: List[List[int]] = []
+    for row_index in sorted(set(row_indices)):
+        if runs and row_index == runs[-1][1] + 1:
+            runs[-1][1] = row_index
+        else:
+            runs.append([row_index, row_index])
+    return [(first, last) for first, last in runs]
+
+
 def remove_rows(sheets_client, spreadsheet_id, row_indices, sheet_name="Sheet1"):
     """
     Delete multiple rows from a specific sheet tab.
@@ -371,13 +526,31 @@ def remove_rows(sheets_client, spreadsheet_id, row_indices, sheet_name="Sheet1")
         sheet_name: Name of the worksheet/tab (default = "Sheet1").
     """
     try:
-        sheet = sheets_client.open_by_key(spreadsheet_id).worksheet(sheet_name)
-
-        # Sort in reverse to prevent index shifting
-        for row_index in sorted(row_indices, reverse=True):
-            row = row_index + 2  # account for 1-indexing + header row
-            sheet.delete_rows(row)
-            logging.info("Deleted row %s (sheet row %s) from %s", row_index, row, sheet_name)
+        spreadsheet = sheets_client.open_by_key(spreadsheet_id)
+        sheet = spreadsheet.worksheet(sheet_name)
+
+        # Collapse into contiguous runs so each run is a single deleteDimension request
+        runs = contiguous_runs(row_indices)
+        if not runs:
+            return
+
+        # One batchUpdate for every run, ordered bottom-up to prevent index shifting.
+        # Ranges are 0-based and end-exclusive; +1 skips the header row.
+        requests = [
+            {
+                "deleteDimension": {
+                    "range": {
+                        "sheetId": sheet.id,
+                        "dimension": "ROWS",
+                        "startIndex": first + 1,
+                        "endIndex": last + 2,
+                    }
+                }
+            }
+            for first, last in reversed(runs)
+        ]
+        spreadsheet.batch_update({"requests": requests})
+        logging.info("Deleted %s row(s) in %s range(s) from %s", sum(last - first + 1 for first, last in runs), len(runs), sheet_name)
 
     except Exception as e:
         logging.error("Failed to delete rows from %s: %s", sheet_name, e)
@@ -386,6 +559,21 @@ def remove_rows(sheets_client, spreadsheet_id, row_indices, sheet_name="Sheet1")
 
 
 
+def _to_sheet_value(value):
+    """
+    Convert a cell value for a RAW append, restoring booleans.
+
+    Sheets reads checkbox and boolean cells back as "TRUE"/"FALSE" text, and a RAW
+    append would store that text literally. Sending real booleans keeps those
+    columns behaving as they did under USER_ENTERED; every other value is unchanged.
+    """
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    if isinstance(value, str) and value.strip().upper() in ("TRUE", "FALSE"):
+        return value.strip().upper() == "TRUE"
+    return value
+
+
 def append_new_rows(sheets_client, spreadsheet_id, new_rows_df, sheet_name = "Sheet1"):
     """
     Appends new rows to a Google Sheet tab in column order, assuming no duplicates.
@@ -404,20 +592,21 @@ def append_new_rows(sheets_client, spreadsheet_id, new_rows_df, sheet_name = "Sh
             logging.warning("No rows to append — DataFrame is empty.")
             return []
 
-        existing_df = fetch_sheet_as_df(sheets_client, spreadsheet_id)
-        headers = list(existing_df.columns)
+        # Only the header row is needed to align columns, not the whole sheet
         sheet = sheets_client.open_by_key(spreadsheet_id).worksheet(sheet_name)
+        headers = sheet.row_values(1)
 
         rows_to_append = []
         appended_dicts = []
 
         for _, row in new_rows_df.iterrows():
             row_dict = {col: row.get(col, "") for col in headers}
-            row_list = [row_dict[col] for col in headers]
+            row_list = [_to_sheet_value(row_dict[col]) for col in headers]
             rows_to_append.append(row_list)
             appended_dicts.append(row_dict)
 
-        sheet.append_rows(rows_to_append, value_input_option="USER_ENTERED")
+        # RAW stores ids and timestamps verbatim instead of having Sheets re-parse every cell
+        sheet.append_rows(rows_to_append, value_input_option="RAW")
         logging.info("✅ Appended %s new row(s) to %s", len(rows_to_append), sheet_name)
 
         return appended_dicts
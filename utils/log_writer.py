@@ -101,7 +101,7 @@ def log_events(
             rows.append(row_values)
             logged_events.append(event)
 
-        ws.append_rows(rows, value_input_option="USER_ENTERED")  # type: ignore
+        ws.append_rows(rows, value_input_option="RAW")  # type: ignore
 
         log_url = f"https://docs.google.com/spreadsheets/d/{spreadsheet_id}"
         logging.info("Admin event log written to: %s", log_url)
@@ -1,5 +1,5 @@
 import logging
-from typing import List, Union
+from typing import FrozenSet, Iterable, List, Optional, Set, Tuple, Union
 import pandas as pd
 from qdrant_client import QdrantClient
 from qdrant_client.http import exceptions as qdrant_exceptions
@@ -23,6 +23,9 @@ def _validate_metadata(metadata: dict, require_file_id: bool = False) -> bool:
 
 config = env_config()
 
+# pdf_ids per filtered delete, keeping each MatchAny request body bounded
+DELETE_PDF_ID_CHUNK_SIZE = 1000
+
 
 def init_qdrant_client(mode: str = "cloud") -> QdrantClient:
     """
@@ -42,7 +45,8 @@ def init_qdrant_client(mode: str = "cloud") -> QdrantClient:
         if mode == "cloud":
             client = QdrantClient(
                 url=config["QDRANT_URL"],
-                api_key=config["QDRANT_API_KEY"]
+                api_key=config["QDRANT_API_KEY"],
+                timeout=RAG_CONFIG["qdrant_timeout"],
             )
         elif mode == "local":
             client = QdrantClient(
@@ -143,10 +147,89 @@ def list_collections(client: QdrantClient) -> List[str]:
         return []
 
 
+def enable_scalar_quantization(
+    client: QdrantClient,
+    collection_name: str,
+    quantile: float = 0.99,
+    always_ram: bool = True,
+) -> bool:
+    """
+    Turn on int8 scalar quantization for an existing Qdrant collection.
+
+    Qdrant keeps a 4x smaller int8 copy of every vector for search and rescores
+    against the originals, so RAM use and bytes scanned per query drop with
+    minimal recall loss. Safe to run more than once.
+
+    Args:
+        client (QdrantClient): An initialized Qdrant client.
+        collection_name (str): Name of the Qdrant collection.
+        quantile (float): Quantile used to clip outliers when computing int8 bounds.
+        always_ram (bool): Keep the quantized vectors in RAM even if originals are on disk.
+
+    Returns:
+        bool: True if the collection was updated, False otherwise.
+    """
+    if collection_name is None:
+        raise ValueError("Missing QDRANT collection name in RAG_CONFIG")
+    try:
+        client.update_collection(
+            collection_name=collection_name,
+            quantization_config=models.ScalarQuantization(
+                scalar=models.ScalarQuantizationConfig(
+                    type=models.ScalarType.INT8,
+                    quantile=quantile,
+                    always_ram=always_ram,
+                )
+            ),
+        )
+        logging.info("✅ Enabled int8 scalar quantization on collection '%s'.", collection_name)
+        return True
+    except (qdrant_exceptions.UnexpectedResponse,
+            qdrant_exceptions.ResponseHandlingException,
+            TypeError, ValueError):
+        logging.exception("❌ Failed to enable quantization on collection '%s'", collection_name)
+        return False
+
+
+def ensure_pdf_id_index(client: QdrantClient, collection_name: str) -> bool:
+    """
+    Create a keyword payload index on `metadata.pdf_id` for an existing collection.
+
+    Every lookup, scroll and delete in this module filters on `metadata.pdf_id`.
+    With the index, Qdrant resolves those filters from the index rather than
+    checking each point's payload. Safe to run more than once.
+
+    Args:
+        client (QdrantClient): An initialized Qdrant client.
+        collection_name (str): Name of the Qdrant collection.
+
+    Returns:
+        bool: True if the index was created or already exists, False otherwise.
+    """
+    if collection_name is None:
+        raise ValueError("Missing QDRANT collection name in RAG_CONFIG")
+    try:
+        client.create_payload_index(
+            collection_name=collection_name,
+            field_name="metadata.pdf_id",
+            field_schema=models.PayloadSchemaType.KEYWORD,
+        )
+        logging.info("✅ Payload index on metadata.pdf_id ready in collection '%s'.", collection_name)
+        return True
+    except (qdrant_exceptions.UnexpectedResponse,
+            qdrant_exceptions.ResponseHandlingException,
+            TypeError, ValueError):
+        logging.exception("❌ Failed to create pdf_id payload index on collection '%s'", collection_name)
+        return False
+
+
 def in_qdrant(client: QdrantClient, collection_name: str, pdf_id: str) -> bool:
     """
     Check if a document with a specific pdf_id exists in the Qdrant collection.
 
+    Single-id form of `get_existing_pdf_ids`; prefer that function when checking
+    several pdf_ids so they share one request.
+
     Args:
         client: Qdrant client instance.
         collection name (str).
@@ -155,31 +238,75 @@ def in_qdrant(client: QdrantClient, collection_name: str, pdf_id: str) -> bool:
     Returns:
         bool: True if the document exists, False otherwise.
     """
+    existing = get_existing_pdf_ids(client, collection_name, [pdf_id], page_size=1)
+    exists = bool(existing)
+    logging.info("PDF ID '%s' existence in collection '%s': %s", pdf_id, collection_name, exists)
+    return exists
+
+
+def get_existing_pdf_ids(
+    client: QdrantClient,
+    collection_name: str,
+    pdf_ids: Iterable[str],
+    page_size: int = 1000,
+) -> Optional[Set[str]]:
+    """
+    Return the subset of `pdf_ids` that already have records in the Qdrant collection.
+
+    Uses one filtered, paginated scroll for the whole batch instead of a lookup per
+    pdf_id, and loads only `metadata.pdf_id` from each payload. Stops paging as soon
+    as every candidate has been seen.
+
+    Args:
+        client: Qdrant client instance.
+        collection_name (str): Name of the Qdrant collection.
+        pdf_ids (Iterable[str]): Candidate PDF IDs.
+        page_size (int): Points fetched per scroll request.
 
+    Returns:
+        Set[str]: Candidate pdf_ids present in Qdrant, or None if Qdrant couldn't be queried.
+    """
     if collection_name is None:
         raise ValueError("Missing QDRANT collection name in RAG_CONFIG")
+
+    candidates = {str(pdf_id) for pdf_id in pdf_ids if pdf_id}
+    if not candidates:
+        return set()
+
+    scroll_filter = models.Filter(
+        must=[
+            models.FieldCondition(
+                key="metadata.pdf_id",
+                match=models.MatchAny(any=sorted(candidates))
+            )
+        ]
+    )
+    found: Set[str] = set()
+    offset = None
     try:
-        search_result = client.search(
-            collection_name=collection_name,
-            query_vector=[0]*1536,  # Dummy vector for filtering only
-            filter={
-                "must": [
-                    {
-                        "key": "pdf_id",
-                        "match": {"value": pdf_id}
-                    }
-                ]
-            },
-            limit=1
-        )
-        exists = len(search_result) > 0
-        logging.info("PDF ID '%s' existence in collection '%s': %s", pdf_id, collection_name, exists)
-        return exists
+        while True:
+            records, offset = client.scroll(
+                collection_name=collection_name,
+                scroll_filter=scroll_filter,
+                with_payload=["metadata.pdf_id"],
+                with_vectors=False,
+                limit=page_size,
+                offset=offset,
+            )
+            for record in records:
+                metadata = (record.payload or {}).get("metadata")
+                if isinstance(metadata, dict) and metadata.get("pdf_id"):
+                    found.add(str(metadata["pdf_id"]))
+            if offset is None or found >= candidates:
+                break
     except (qdrant_exceptions.UnexpectedResponse,
-                qdrant_exceptions.ResponseHandlingException,
-                TypeError, ValueError):
-        logging.exception("Error checking PDF ID in Qdrant: %s")
-        return False
+            qdrant_exceptions.ResponseHandlingException,
+            TypeError, ValueError):
+        logging.exception("Error prefetching pdf_ids from Qdrant collection '%s'", collection_name)
+        return None
+
+    logging.info("%s of %s pdf_id(s) already in collection '%s'.", len(found), len(candidates), collection_name)
+    return found
 
 
 def check_record_exists(client: QdrantClient, collection_name: str, record_id: Union[str, int]) -> bool:
@@ -208,100 +335,108 @@ def check_record_exists(client: QdrantClient, collection_name: str, record_id: U
 
 
 
-def get_all_pdf_ids_in_qdrant(client: QdrantClient, collection_name: str) -> List[str]:
+def get_all_pdf_ids_in_qdrant(
+    client: QdrantClient, collection_name: str, page_size: int = 10000
+) -> FrozenSet[str]:
     """
-    Retrieve a list of all unique pdf_ids stored in the Qdrant collection.
+    Retrieve the set of all unique pdf_ids stored in the Qdrant collection.
 
     Args:
         client: Qdrant client instance.
         collection_name: name of Qdrant collection
+        page_size (int): Points fetched per scroll request.
 
     Returns:
-        List of unique pdf_ids found in the Qdrant collection.
+        FrozenSet[str]: Unique pdf_ids found in the Qdrant collection, ready for set
+        difference and membership tests without another conversion.
     """
     try:
-        all_records = client.scroll(
-            collection_name=collection_name,
-            scroll_filter=None,
-            with_payload=True,
-            with_vectors=False,
-            limit=100000
-        )
+        unique_pdf_ids: Set[str] = set()
+        scroll_offset = None
+        while True:
+            # Only metadata.pdf_id is needed; chunk text and the rest of the metadata stay on the server
+            records, scroll_offset = client.scroll(
+                collection_name=collection_name,
+                scroll_filter=None,
+                with_payload=["metadata.pdf_id"],
+                with_vectors=False,
+                limit=page_size,
+                offset=scroll_offset
+            )
 
-        records = all_records[0]
+            for idx, record in enumerate(records):
+                payload = record.payload
 
-        unique_pdf_ids = set()
-        for idx, record in enumerate(records):
-            payload = record.payload
+                if not isinstance(payload, dict):
+                    logging.warning("🚫 Payload at index %s is not a dict: %s", idx, payload)
+                    continue
 
-            if not isinstance(payload, dict):
-                logging.warning("🚫 Payload at index %s is not a dict: %s", idx, payload)
-                logging.warning(f"⚠️ Malformed payload: {payload}")
-                continue
+                metadata = payload.get("metadata")
+                if not isinstance(metadata, dict):
+                    logging.warning("🚫 metadata missing or not a dict at index %s: %s", idx, payload)
+                    continue
 
-            metadata = payload.get("metadata")
-            if not isinstance(metadata, dict):
-                logging.warning("🚫 metadata missing or not a dict at index %s: %s", idx, payload)
-                continue
+                pdf_id = metadata.get("pdf_id")
+                if pdf_id:
+                    unique_pdf_ids.add(str(pdf_id))
 
-            pdf_id = metadata.get("pdf_id")
-            if pdf_id:
-                unique_pdf_ids.add(str(pdf_id))
+            if scroll_offset is None:
+                break
 
         logging.info("Retrieving all %s pdf_ids from Qdrant collection.", len(unique_pdf_ids))
-        return list(unique_pdf_ids)
+        return frozenset(unique_pdf_ids)
 
     except (qdrant_exceptions.UnexpectedResponse,
                 qdrant_exceptions.ResponseHandlingException,
                 TypeError, ValueError):
         logging.exception("Error retrieving pdf_ids from Qdrant: %s")
-        return []
+        return frozenset()
 
 
 
-def get_summaries_by_pdf_id(client: QdrantClient, collection_name: str, pdf_ids: List[str]) -> pd.DataFrame:
+SUMMARY_COLUMNS = ["pdf_id", "pdf_file_name", "title", "record_count", "page_count", "point_ids"]
+FILE_ID_COLUMNS = ["pdf_id", "gcp_file_ids", "unique_file_count"]
+
+
+def get_pdf_summaries_and_file_ids(
+    client: QdrantClient,
+    collection_name: str,
+    pdf_ids: Optional[List[str]] = None,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
     """
-    Retrieve summaries of specific records in a Qdrant collection, grouped by metadata.pdf_id.
+    Scroll the matching records once and build both per-pdf_id views from that pass.
 
     Args:
         client (QdrantClient): Qdrant client instance.
         collection_name (str): Name of the Qdrant collection.
-        pdf_ids (List[str]): List of pdf_ids to retrieve summaries for.
+        pdf_ids (List[str], optional): pdf_ids to match against metadata.pdf_id.
+            None scans the whole collection.
 
     Returns:
-        pd.DataFrame: A dataframe with columns:
-            - pdf_id (str)
-            - pdf_file_name (str, if available)
-            - title (str, if available)
-            - record_count (int)
-            - page_count (int, max page_number + 1)
-            - point_ids (List[str])
-            
+        Tuple[pd.DataFrame, pd.DataFrame]: The frames returned by `get_summaries_by_pdf_id`
+        and `get_gcp_file_ids_by_pdf_id`, in that order.
+
     Notes:
-    - Records with invalid metadata (e.g., missing pdf_id) are skipped.
-    - `gcp_file_id` is not required in metadata for a record to be counted.
-    - `title`, `pdf_file_name`, and `page_count` are taken from the first valid record that contains them.
-    - All matching point IDs for a given pdf_id are collected into the `point_ids` list.
-    - The function performs a full scroll of all matching points in batches (limit=100,000).
-    - Returns an empty DataFrame if no matching pdf_ids are found or input is empty.
+    - Only the `metadata` payload key is fetched; chunk text is never transferred.
+    - Records with invalid metadata (e.g., missing pdf_id) are skipped by both views.
     """
-    if not pdf_ids:
-        return pd.DataFrame(columns=["pdf_id", "pdf_file_name", "title", "record_count", "page_count", "point_ids"])
+    if pdf_ids is not None and not pdf_ids:
+        return pd.DataFrame(columns=SUMMARY_COLUMNS), pd.DataFrame(columns=FILE_ID_COLUMNS)
+
+    scroll_filter = None
+    if pdf_ids is not None:
+        scroll_filter = models.Filter(
+            must=[models.FieldCondition(key="metadata.pdf_id", match=models.MatchAny(any=pdf_ids))]
+        )
 
     summary = {}
+    file_map: dict[str, set[str]] = {}
     scroll_offset = None
     while True:
         results, scroll_offset = client.scroll(
             collection_name=collection_name,
-            scroll_filter=models.Filter(
-                must=[
-                    models.FieldCondition(
-                        key="metadata.pdf_id",
-                        match=models.MatchAny(any=pdf_ids)
-                    )
-                ]
-            ),
-            with_payload=True,
+            scroll_filter=scroll_filter,
+            with_payload=["metadata"],
             with_vectors=False,
             limit=100000,
             offset=scroll_offset
@@ -323,7 +458,7 @@ def get_summaries_by_pdf_id(client: QdrantClient, collection_name: str, pdf_ids:
                 continue
 
             pdf_id = metadata.get("pdf_id")
-            
+
             title = metadata.get("title")
             pdf_file_name = metadata.get("pdf_file_name")
             page_count = metadata.get("page_count")
@@ -347,10 +482,53 @@ def get_summaries_by_pdf_id(client: QdrantClient, collection_name: str, pdf_ids:
                 if not summary[pdf_id]["page_count"] and page_count:
                     summary[pdf_id]["page_count"] = page_count
 
+            # Records without a gcp_file_id still get an entry so that
+            # build_status_map can flag them appropriately.
+            fid = metadata.get("gcp_file_id") or metadata.get("file_id")
+            file_map.setdefault(str(pdf_id), set())
+            if fid:
+                file_map[str(pdf_id)].add(str(fid))
+
         if scroll_offset is None:
             break
 
-    return pd.DataFrame(summary.values())
+    file_rows = [
+        {"pdf_id": pid, "gcp_file_ids": sorted(list(fids)), "unique_file_count": len(fids)}
+        for pid, fids in file_map.items()
+    ]
+    return (
+        pd.DataFrame(list(summary.values()), columns=SUMMARY_COLUMNS),
+        pd.DataFrame(file_rows, columns=FILE_ID_COLUMNS),
+    )
+
+
+def get_summaries_by_pdf_id(client: QdrantClient, collection_name: str, pdf_ids: List[str]) -> pd.DataFrame:
+    """
+    Retrieve summaries of specific records in a Qdrant collection, grouped by metadata.pdf_id.
+
+    Args:
+        client (QdrantClient): Qdrant client instance.
+        collection_name (str): Name of the Qdrant collection.
+        pdf_ids (List[str]): List of pdf_ids to retrieve summaries for.
+
+    Returns:
+        pd.DataFrame: A dataframe with columns:
+            - pdf_id (str)
+            - pdf_file_name (str, if available)
+            - title (str, if available)
+            - record_count (int)
+            - page_count (int, max page_number + 1)
+            - point_ids (List[str])
+            
+    Notes:
+    - Records with invalid metadata (e.g., missing pdf_id) are skipped.
+    - `gcp_file_id` is not required in metadata for a record to be counted.
+    - `title`, `pdf_file_name`, and `page_count` are taken from the first valid record that contains them.
+    - All matching point IDs for a given pdf_id are collected into the `point_ids` list.
+    - The function performs a full scroll of all matching points in batches (limit=100,000).
+    - Returns an empty DataFrame if no matching pdf_ids are found or input is empty.
+    """
+    return get_pdf_summaries_and_file_ids(client, collection_name, pdf_ids)[0]
 
 
 def get_gcp_file_ids_by_pdf_id(client: QdrantClient, collection_name: str, pdf_ids: List[str]) -> pd.DataFrame:
@@ -377,45 +555,7 @@ def get_gcp_file_ids_by_pdf_id(client: QdrantClient, collection_name: str, pdf_i
         - Records with invalid or missing metadata are skipped.
         - This function does not return duplicate file IDs for the same pdf_id.
     """
-    if not pdf_ids:
-        return pd.DataFrame(columns=["pdf_id", "gcp_file_ids", "unique_file_count"])
-
-    file_map: dict[str, set[str]] = {}
-    filter_condition = models.Filter(
-        must=[models.FieldCondition(key="metadata.pdf_id", match=models.MatchAny(any=pdf_ids))]
-    )
-    scroll_offset = None
-    while True:
-        results, scroll_offset = client.scroll(
-            collection_name=collection_name,
-            scroll_filter=filter_condition,
-            with_payload=True,
-            with_vectors=False,
-            limit=100000,
-            offset=scroll_offset,
-        )
-        for rec in results:
-            payload = rec.payload
-            if not isinstance(payload, dict):
-                continue
-            meta = payload.get("metadata", {})
-            # Include records even when gcp_file_id is missing so that
-            # build_status_map can flag them appropriately.
-            if not _validate_metadata(meta, require_file_id=False):
-                continue
-            pid = meta.get("pdf_id")
-            fid = meta.get("gcp_file_id") or meta.get("file_id")
-            file_map.setdefault(str(pid), set())
-            if fid:
-                file_map[str(pid)].add(str(fid))
-        if scroll_offset is None:
-            break
-
-    rows = [
-        {"pdf_id": pid, "gcp_file_ids": sorted(list(fids)), "unique_file_count": len(fids)}
-        for pid, fids in file_map.items()
-    ]
-    return pd.DataFrame(rows)
+    return get_pdf_summaries_and_file_ids(client, collection_name, pdf_ids)[1]
 
 
 def get_unique_metadata_df(client: QdrantClient, collection_name: str) -> pd.DataFrame:
@@ -511,9 +651,7 @@ def update_qdrant_file_ids_for_live_rows(qdrant_client: QdrantClient, sheets_cli
         return pd.DataFrame()
     live_df = library_df[library_df["status"] == "live"]
     results = []
-    for _, row in live_df.iterrows():
-        pdf_id = str(row.get("pdf_id", ""))
-        file_id = str(row.get("gcp_file_id", ""))
+    for pdf_id, file_id in zip(live_df["pdf_id"].astype(str), live_df["gcp_file_id"].astype(str)):
         if not pdf_id or not file_id:
             continue
         success = update_file_id_for_pdf_id(qdrant_client, collection_name, pdf_id, file_id)
@@ -545,14 +683,17 @@ def delete_records_by_pdf_id(
         logging.info("🟡 No PDF IDs provided to delete from Qdrant.")
         return
 
-    for pdf_id in unique_pdf_ids:
+    pdf_id_list = [str(pdf_id) for pdf_id in unique_pdf_ids]
+    logging.info("🗑️ Deleting records for %s pdf_id(s): %s", len(pdf_id_list), pdf_id_list)
+    # One filtered delete per chunk of pdf_ids instead of one request per pdf_id
+    for start in range(0, len(pdf_id_list), DELETE_PDF_ID_CHUNK_SIZE):
+        chunk = pdf_id_list[start:start + DELETE_PDF_ID_CHUNK_SIZE]
         try:
-            logging.info("🗑️ Deleting records for pdf_id: %s", pdf_id)
             filter_condition = models.Filter(
                 must=[
                     models.FieldCondition(
                         key="metadata.pdf_id",
-                        match=models.MatchText(text=pdf_id)
+                        match=models.MatchAny(any=chunk)
                     )
                 ]
             )
@@ -560,11 +701,12 @@ def delete_records_by_pdf_id(
                 collection_name=collection_name,
                 points_selector=filter_condition
             )
-            logging.info("✅ Deleted points for pdf_id %s. Operation ID: %s", pdf_id, result.operation_id)
+            logging.info("✅ Deleted points for %s pdf_id(s). Operation ID: %s", len(chunk), result.operation_id)
             if log_event_fn:
-                log_event_fn("orphan_qdrant_record_deleted", str(pdf_id), f"Deleted from {collection_name}")
+                for pdf_id in chunk:
+                    log_event_fn("orphan_qdrant_record_deleted", pdf_id, f"Deleted from {collection_name}")
 
         except (qdrant_exceptions.UnexpectedResponse,
                 qdrant_exceptions.ResponseHandlingException,
                 TypeError, ValueError):
-            logging.exception("❌ Failed to delete records for pdf_id %s", pdf_id)
\ No newline at end of file
+            logging.exception("❌ Failed to delete records for pdf_ids %s", chunk)